@@ -1,8 +1,5 @@
 import validators,streamlit as st
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import YoutubeLoader,UnstructuredURLLoader
+from summarizer import ContentSource, SummarizationPipeline, SummaryRequest
 
 
 ## sstreamlit APP
@@ -18,15 +15,19 @@ with st.sidebar:
 
 generic_url=st.text_input("URL",label_visibility="collapsed")
 
-## Gemma Model USsing Groq API
-llm =ChatGroq(model="gemma2-9b-it", groq_api_key=groq_api_key)
-
 prompt_template="""
 Provide a summary of the following content in 300 words:
 Content:{text}
 
 """
-prompt=PromptTemplate(template=prompt_template,input_variables=["text"])
+
+## Gemma Model USsing Groq API, no extra analysis for the quick app
+## built once per process; chat clients come from the shared pool when a key is used
+@st.cache_resource
+def get_pipeline():
+    return SummarizationPipeline(key_validator=lambda api_key: True)
+
+pipeline=get_pipeline()
 
 if st.button("Summarize the Content from YT or Website"):
     ## Validate all the inputs
@@ -38,19 +39,18 @@ if st.button("Summarize the Content from YT or Website"):
     else:
         try:
             with st.spinner("Waiting..."):
-                ## loading the website or yt video data
-                if "youtube.com" in generic_url:
-                    loader=YoutubeLoader.from_youtube_url(generic_url,add_video_info=True)
-                else:
-                    loader=UnstructuredURLLoader(urls=[generic_url],ssl_verify=False,
-                                                 headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"})
-                docs=loader.load()
-
-                ## Chain For Summarization
-                chain=load_summarize_chain(llm,chain_type="stuff",prompt=prompt)
-                output_summary=chain.run(docs)
-
-                st.success(output_summary)
+                ## loading the website or yt video data and summarizing it
+                result=pipeline.run(SummaryRequest(
+                    source=ContentSource("url",generic_url,video_info=True),
+                    api_key=groq_api_key,
+                    model="gemma2-9b-it",
+                    prompt_template=prompt_template,
+                    enable_sentiment=False,
+                    enable_keywords=False,
+                    enable_readability=False,
+                    enable_wordcloud=False
+                ))
+
+                st.success(result.summary)
         except Exception as e:
             st.exception(e)
-                    
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Earlier implementations kept only so the benchmarks can report speedups."""
+import re
+from collections import Counter
+
+from summarizer.analysis import negative_words, positive_words, readability_level, stop_words
+
+
+def legacy_analyze_content(original_text):
+    # The analysis block as main.py ran it before the single-pass TextStats engine
+    analysis_results = {}
+
+    text_lower = original_text.lower()
+    pos_count = sum(1 for word in positive_words if word in text_lower)
+    neg_count = sum(1 for word in negative_words if word in text_lower)
+    if pos_count > neg_count:
+        analysis_results['sentiment'] = {'score': "Positive", 'class': "sentiment-positive"}
+    elif neg_count > pos_count:
+        analysis_results['sentiment'] = {'score': "Negative", 'class': "sentiment-negative"}
+    else:
+        analysis_results['sentiment'] = {'score': "Neutral", 'class': "sentiment-neutral"}
+
+    clean_text = re.sub(r'[^\w\s]', '', text_lower)
+    words = clean_text.split()
+    filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+    analysis_results['keywords'] = Counter(filtered_words).most_common(10)
+
+    try:
+        import textstat
+        flesch_score = textstat.flesch_reading_ease(original_text)
+        analysis_results['readability'] = {
+            'flesch_score': flesch_score,
+            'grade_level': textstat.flesch_kincaid_grade(original_text),
+            'level': readability_level(flesch_score)
+        }
+    except ImportError:
+        pass
+
+    analysis_results['wordcloud'] = dict(analysis_results['keywords'])
+    len(original_text.split())
+    return analysis_results
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChatModel:
+    """Deterministic offline stand-in for ChatGroq.
+
+    Implements the ``invoke``/``ainvoke``/``astream`` surface the pipeline uses.
+    Each call waits ``latency`` seconds (time to first token), then emits
+    ``output_tokens`` words at ``tokens_per_second``. The reply is built from
+    words of the prompt, so the same prompt always gets the same answer.
+    """
+
+    def __init__(self, latency=0.05, tokens_per_second=500.0, output_tokens=120):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.prompt_tokens = self.completion_tokens = 0
+
+    def _reply_words(self, prompt):
+        words = prompt.split()
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += len(words)
+            self.completion_tokens += min(self.output_tokens, len(words))
+        if len(words) <= self.output_tokens:
+            return words
+        stride = len(words) / self.output_tokens
+        return [words[int(i * stride)] for i in range(self.output_tokens)]
+
+    def _duration(self, n_words):
+        return self.latency + n_words / self.tokens_per_second
+
+    def invoke(self, prompt, config=None):
+        words = self._reply_words(prompt)
+        time.sleep(self._duration(len(words)))
+        return FakeMessage(" ".join(words))
+
+    async def ainvoke(self, prompt, config=None):
+        words = self._reply_words(prompt)
+        await asyncio.sleep(self._duration(len(words)))
+        return FakeMessage(" ".join(words))
+
+    async def astream(self, prompt, config=None):
+        words = self._reply_words(prompt)
+        await asyncio.sleep(self.latency)
+        # Emit in small bursts; one sleep per token would measure the event loop, not the model
+        burst = 8
+        for i in range(0, len(words), burst):
+            await asyncio.sleep(len(words[i:i + burst]) / self.tokens_per_second)
+            yield FakeMessage(" ".join(words[i:i + burst]) + " ")
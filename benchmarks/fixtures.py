@@ -0,0 +1,72 @@
+import json
+import os
+import random
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDF_PATH = os.path.join(REPO_ROOT, "apjspeech.pdf")
+NOTEBOOK_PATH = os.path.join(REPO_ROOT, "text-summarization.ipynb")
+
+_vocabulary = (
+    "the model data system people country government program scheme speech video lecture "
+    "transcript research result market growth energy climate policy learning network school "
+    "student teacher village family house health water future technology science history "
+    "good great excellent success win best bad problem issue failure worst "
+    "window winner issues successful however therefore because although while during"
+).split()
+
+
+def notebook_speech():
+    # The speech text the notebook summarizes, read straight from the notebook cell
+    with open(NOTEBOOK_PATH, encoding="utf-8") as f:
+        notebook = json.load(f)
+    for cell in notebook['cells']:
+        source = "".join(cell['source'])
+        match = re.search(r'speech\s*=\s*"""(.*?)"""', source, re.S)
+        if match:
+            return match.group(1).strip()
+    raise LookupError("speech cell not found in notebook")
+
+
+def synthetic_transcript(n_words, seed=0):
+    rng = random.Random(seed)
+    words = []
+    sentence_length = 0
+    for _ in range(n_words):
+        word = rng.choice(_vocabulary)
+        if sentence_length == 0:
+            word = word.capitalize()
+        sentence_length += 1
+        if sentence_length >= rng.randint(8, 24):
+            word += rng.choice(".?!")
+            sentence_length = 0
+        elif rng.random() < 0.05:
+            word += ","
+        words.append(word)
+    return " ".join(words)
+
+
+def load_pdf_documents():
+    from langchain_community.document_loaders import PyPDFLoader
+    return PyPDFLoader(PDF_PATH).load()
+
+
+def as_documents(text, chunk_words=None):
+    from langchain.schema import Document
+
+    if not chunk_words:
+        return [Document(page_content=text)]
+    # Transcripts arrive as many small documents; mimic that shape
+    words = text.split(" ")
+    return [Document(page_content=" ".join(words[i:i + chunk_words])) for i in range(0, len(words), chunk_words)]
+
+
+def fixtures(sizes=(10_000, 100_000, 500_000, 1_000_000)):
+    """Yield (name, documents) pairs; fixtures needing missing extras are skipped."""
+    try:
+        yield "apjspeech.pdf", load_pdf_documents()
+    except ImportError:
+        pass
+    yield "notebook_speech", as_documents(notebook_speech())
+    for size in sizes:
+        yield f"synthetic_{size // 1000}k", as_documents(synthetic_transcript(size, seed=size), chunk_words=2000)
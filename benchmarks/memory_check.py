@@ -0,0 +1,93 @@
+"""Check that streaming analysis keeps peak memory flat as documents grow.
+
+Usage:
+    python -m benchmarks.memory_check
+    python -m benchmarks.memory_check --sizes 100000 2000000 --tolerance 1.5
+
+Documents are produced by a generator and keep bringing words not seen before,
+as names and jargon do in a real transcript, with the vocabulary growing as the
+square root of the length (Heaps' law), so the running counters grow too.
+
+Each case runs once untraced first, so imports and one-time setup do not land
+in the smallest size's peak. Under tracemalloc the working memory (peak minus
+what the result still holds) for the largest size must stay within
+``tolerance`` times that of the smallest, and what the result holds may only
+grow with the vocabulary; exits non-zero otherwise. tests/test_memory.py runs
+the same check with smaller sizes.
+"""
+import argparse
+import math
+import sys
+import tracemalloc
+
+from benchmarks.fixtures import synthetic_transcript
+from summarizer.analysis import TextStats
+from summarizer.cache import content_hash
+
+DOC_WORDS = 2000
+# Distinct rare words after n documents: HEAPS_K * sqrt(n)
+HEAPS_K = 200
+WARMUP_WORDS = 10_000
+
+
+def iter_documents(n_words):
+    from langchain.schema import Document
+
+    for i in range(n_words // DOC_WORDS):
+        rare = [f"term{j}" for j in range(int(HEAPS_K * math.sqrt(i)), int(HEAPS_K * math.sqrt(i + 1)))]
+        text = synthetic_transcript(DOC_WORDS - len(rare), seed=i)
+        yield Document(page_content=" ".join([text, *rare]))
+
+
+CASES = {
+    # name: (run, size of the vocabulary the result may grow with, or None when it must not grow)
+    'analysis': (lambda n: TextStats.from_documents(iter_documents(n)), lambda stats: len(stats.counts)),
+    'content_hash': (lambda n: content_hash(doc.page_content for doc in iter_documents(n)), None),
+}
+
+
+def measure(run, n_words):
+    """Return (result, working, retained): bytes traced while running ``run(n_words)``."""
+    tracemalloc.start()
+    try:
+        result = run(n_words)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak - retained, retained
+
+
+def check_case(name, sizes, tolerance):
+    """Measure one case at each size; returns (ok, rows) with rows of (size, working, retained)."""
+    run, vocabulary = CASES[name]
+    run(WARMUP_WORDS)
+    rows, allowed = [], []
+    for size in sorted(sizes):
+        result, working, retained = measure(run, size)
+        rows.append((size, working, retained))
+        # Retained bytes per distinct word must stay flat; without a vocabulary, bytes outright
+        allowed.append(retained / vocabulary(result) if vocabulary else max(retained, 64 * 1024))
+        del result
+    ok = rows[-1][1] <= tolerance * rows[0][1] and allowed[-1] <= tolerance * allowed[0]
+    return ok, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify that streaming analysis memory does not grow with document size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="Transcript sizes in words")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed ratio of largest to smallest working memory")
+    args = parser.parse_args(argv)
+    if len(set(args.sizes)) < 2:
+        parser.error("--sizes needs at least two different sizes")
+
+    failed = False
+    for name in CASES:
+        ok, rows = check_case(name, args.sizes, args.tolerance)
+        failed |= not ok
+        sizes = "  ".join(f"{size // 1000}k={working / 1024:.0f}+{retained / 1024:.0f}KiB" for size, working, retained in rows)
+        print(f"{name:<14} {sizes}  (working+retained)  {'ok' if ok else 'FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Offline benchmark suite for loaders, chains and content analysis.
+
+Usage:
+    python -m benchmarks.run                          # full suite, writes benchmarks/results/<timestamp>.json
+    python -m benchmarks.run --sizes 10000 --repeat 1
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+No network is used: ChatGroq is replaced by benchmarks.fake_llm.FakeChatModel
+with configurable latency and tokens/sec, and the rate limiter is opened up
+so only the fake model's timing shapes the results.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.baselines import legacy_analyze_content
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.fixtures import REPO_ROOT, fixtures, load_pdf_documents
+from summarizer.loader_cache import deserialize_documents, serialize_documents
+from summarizer.pipeline import SummarizationPipeline, SummaryRequest
+from summarizer.scheduler import LLMScheduler
+from summarizer.sources import ContentSource
+
+SCHEMA_VERSION = 1
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+BENCH_MODEL = "gemma2-9b-it"
+
+
+def measure(fn, repeat=3, memory=True):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        # Separate run: tracemalloc overhead would distort the wall times
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'wall_time': statistics.median(times), 'wall_times': times, 'peak_memory_bytes': peak}
+
+
+def word_count(docs):
+    return sum(len(doc.page_content.split()) for doc in docs)
+
+
+def bench_loaders(fixture_docs, args):
+    results = []
+    try:
+        results.append({'case': "load", 'name': "pypdf", 'fixture': "apjspeech.pdf",
+                        **measure(load_pdf_documents, args.repeat, not args.no_memory)})
+    except ImportError:
+        pass
+    for name, docs in fixture_docs:
+        results.append({'case': "load", 'name': "loader_cache_roundtrip", 'fixture': name, 'words': word_count(docs),
+                        **measure(lambda: deserialize_documents(serialize_documents(docs)), args.repeat, not args.no_memory)})
+    return results
+
+
+def bench_chains(fixture_docs, args):
+    fake = FakeChatModel(latency=args.latency, tokens_per_second=args.tokens_per_second, output_tokens=args.output_tokens)
+    pipeline = SummarizationPipeline(
+        llm_factory=lambda model, api_key: fake,
+        key_validator=lambda api_key: True,
+        scheduler=LLMScheduler(max_concurrency=args.concurrency, limits={BENCH_MODEL: (10 ** 9, 10 ** 12)})
+    )
+
+    results = []
+    for name, docs in fixture_docs:
+        words = word_count(docs)
+        for chain_type in ("stuff", "map_reduce", "refine"):
+            request = SummaryRequest(source=ContentSource("text", ""), api_key="offline", model=BENCH_MODEL, chain_type=chain_type)
+            plan = pipeline.plan(docs, request)
+            entry = {'case': "chain", 'name': chain_type, 'fixture': name, 'words': words}
+            if chain_type == "stuff" and plan.token_count > plan.input_budget:
+                results.append({**entry, 'skipped': "input exceeds the model context window"})
+                continue
+            if chain_type == "refine" and words > args.refine_max_words:
+                results.append({**entry, 'skipped': f"refine limited to {args.refine_max_words} words"})
+                continue
+
+            last_plan = {}
+
+            def run_chain():
+                fake.reset()
+                run_plan = pipeline.plan(docs, request)
+                pipeline.summarize(docs, request, run_plan)
+                last_plan.update(plan=run_plan, calls=fake.calls, prompt_tokens=fake.prompt_tokens,
+                                 completion_tokens=fake.completion_tokens)
+
+            stats = measure(run_chain, args.repeat, not args.no_memory)
+            results.append({
+                **entry,
+                **stats,
+                'llm_calls': last_plan['calls'],
+                'prompt_tokens': last_plan['prompt_tokens'],
+                'completion_tokens': last_plan['completion_tokens'],
+                'chunks': last_plan['plan'].chunk_count,
+                'token_count': last_plan['plan'].token_count,
+            })
+            print(f"  chain {chain_type:<10} {name:<16} {stats['wall_time']:8.3f}s  {last_plan['calls']} calls", file=sys.stderr)
+    return results
+
+
+def cosine(a, b):
+    import numpy as np
+    return float(np.dot(a, b) / ((np.linalg.norm(a) * np.linalg.norm(b)) or 1.0))
+
+
+def bench_extractive(fixture_docs, args):
+    """Full-text vs extractive pre-compression: prompt tokens, wall time and summary agreement.
+
+    Quality is the cosine similarity between embeddings of the two summaries
+    plus the share of the source's top keywords that survive compression.
+    With the fake model the summaries are samples of the prompt, so this
+    mostly measures how representative the selected sentences are.
+    """
+    from summarizer.analysis import TextStats
+    from summarizer.compress import compress_documents, default_embedder
+
+    try:
+        default_embedder(["warm up"])
+    except ImportError:
+        print("  extractive: sentence-transformers not installed, skipped", file=sys.stderr)
+        return []
+
+    fake = FakeChatModel(latency=args.latency, tokens_per_second=args.tokens_per_second, output_tokens=args.output_tokens)
+    pipeline = SummarizationPipeline(
+        llm_factory=lambda model, api_key: fake,
+        key_validator=lambda api_key: True,
+        scheduler=LLMScheduler(max_concurrency=args.concurrency, limits={BENCH_MODEL: (10 ** 9, 10 ** 12)})
+    )
+
+    results = []
+    for name, docs in fixture_docs:
+        words = word_count(docs)
+        runs = {}
+        for extractive in (False, True):
+            request = SummaryRequest(source=ContentSource("text", " ".join(doc.page_content for doc in docs)),
+                                     api_key="offline", model=BENCH_MODEL, extractive=extractive, enable_wordcloud=False)
+            fake.reset()
+            start = time.perf_counter()
+            result = pipeline.run(request)
+            runs[extractive] = {'wall_time': time.perf_counter() - start, 'prompt_tokens': fake.prompt_tokens,
+                                'llm_calls': fake.calls, 'result': result}
+
+        full, extractive = runs[False], runs[True]
+        if extractive['result'].compression is None:
+            results.append({'case': "extractive", 'name': "pre_compression", 'fixture': name, 'words': words,
+                            'skipped': "below the compression threshold"})
+            continue
+
+        # Recompute the selection to see which of the source's top keywords it kept
+        compressed_docs, _ = compress_documents(docs, extractive['result'].compression['budget'])
+        top_words = [word for word, _ in TextStats.from_documents(docs).top_words(20)]
+        kept = TextStats.from_documents(compressed_docs).counts
+        summary_embeddings = default_embedder([full['result'].summary, extractive['result'].summary])
+        entry = {
+            'case': "extractive",
+            'name': "pre_compression",
+            'fixture': name,
+            'words': words,
+            'wall_time': extractive['wall_time'],
+            'full_wall_time': full['wall_time'],
+            'prompt_tokens': extractive['prompt_tokens'],
+            'full_prompt_tokens': full['prompt_tokens'],
+            'token_reduction': full['prompt_tokens'] / max(1, extractive['prompt_tokens']),
+            'llm_calls': extractive['llm_calls'],
+            'full_llm_calls': full['llm_calls'],
+            'compression': extractive['result'].compression,
+            'summary_similarity': cosine(*summary_embeddings),
+            'keyword_recall': sum(1 for word in top_words if word in kept) / max(1, len(top_words)),
+        }
+        results.append(entry)
+        print(f"  extractive {name:<14} {entry['token_reduction']:5.1f}x fewer prompt tokens  "
+              f"{full['wall_time']:7.2f}s -> {extractive['wall_time']:7.2f}s  similarity {entry['summary_similarity']:.3f}  "
+              f"keyword recall {entry['keyword_recall']:.0%}",
+              file=sys.stderr)
+    return results
+
+
+def bench_analysis(fixture_docs, args):
+    pipeline = SummarizationPipeline(key_validator=lambda api_key: True)
+    request = SummaryRequest(source=ContentSource("text", ""), api_key="offline")
+    results = []
+    for name, docs in fixture_docs:
+        text = " ".join(doc.page_content for doc in docs)
+        words = word_count(docs)
+        stats = measure(lambda: pipeline.analyze(text, request), args.repeat, not args.no_memory)
+        results.append({'case': "analysis", 'name': "analyze_content", 'fixture': name, 'words': words, **stats})
+        legacy = measure(lambda: legacy_analyze_content(text), args.repeat, not args.no_memory)
+        results.append({'case': "analysis", 'name': "analyze_content_legacy", 'fixture': name, 'words': words, **legacy})
+        speedup = legacy['wall_time'] / stats['wall_time'] if stats['wall_time'] else 0.0
+        print(f"  analysis {name:<16} {stats['wall_time']:8.3f}s  legacy {legacy['wall_time']:8.3f}s  {speedup:5.1f}x", file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(result):
+    return result['case'], result['name'], result['fixture']
+
+
+def compare(current, baseline):
+    previous = {result_key(r): r for r in baseline['results'] if 'wall_time' in r}
+    print(f"{'case':<10} {'name':<24} {'fixture':<18} {'time Δ':>9} {'memory Δ':>9}")
+    for result in current['results']:
+        before = previous.get(result_key(result))
+        if before is None or 'wall_time' not in result:
+            continue
+        time_delta = result['wall_time'] / before['wall_time'] - 1 if before['wall_time'] else 0.0
+        memory = ""
+        if result.get('peak_memory_bytes') and before.get('peak_memory_bytes'):
+            memory = f"{result['peak_memory_bytes'] / before['peak_memory_bytes'] - 1:+9.1%}"
+        print(f"{result['case']:<10} {result['name']:<24} {result['fixture']:<18} {time_delta:+9.1%} {memory:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline summarizer benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000, 1_000_000], help="Synthetic transcript sizes in words")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (median is reported)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--output-tokens", type=int, default=120)
+    parser.add_argument("--concurrency", type=int, default=8, help="LLMScheduler max_concurrency")
+    parser.add_argument("--refine-max-words", type=int, default=100_000, help="Skip refine above this size; it is sequential")
+    parser.add_argument("--only", choices=["load", "chain", "analysis", "extractive"], nargs="+",
+                        default=["load", "chain", "analysis", "extractive"])
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Print deltas against an earlier result file")
+    args = parser.parse_args(argv)
+
+    fixture_docs = list(fixtures(tuple(args.sizes)))
+    results = []
+    if "load" in args.only:
+        results += bench_loaders(fixture_docs, args)
+    if "chain" in args.only:
+        results += bench_chains(fixture_docs, args)
+    if "analysis" in args.only:
+        results += bench_analysis(fixture_docs, args)
+    if "extractive" in args.only:
+        results += bench_extractive(fixture_docs, args)
+
+    report = {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        'results': results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,23 @@
 import validators
 import streamlit as st
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import YoutubeLoader, UnstructuredURLLoader, WikipediaLoader
 import time
 from datetime import datetime, timedelta
-import re
 import json
 import plotly.graph_objects as go
 import plotly.express as px
-from collections import Counter
 import pandas as pd
-import requests
-import textstat
 import nltk
 from wordcloud import WordCloud
 import io
 import base64
 import os
+import uuid
+
+from summarizer import ContentSource, DuplicateIndex, HistoryStore, InvalidAPIKeyError, LoaderCache, SourceLoadError, SummarizationPipeline, SummaryCache, SummaryRequest, resolve_source
+from summarizer.config import AUTO_MODEL, DEFAULT_MODEL, LOCAL_MODELS, language_options, model_info, model_options, summary_lengths, summary_types, word_count_for_length
+from summarizer.files import SUPPORTED_EXTENSIONS, remove_upload, save_upload
+from summarizer.groq_api import available_models
+from summarizer.history import history_owner
 
 # Download required NLTK data
 try:
@@ -26,12 +25,6 @@ try:
 except LookupError:
     nltk.download('punkt')
 
-def flesch_reading_ease(text):
-    return textstat.flesch_reading_ease(text)
-
-def flesch_kincaid_grade(text):
-    return textstat.flesch_kincaid_grade(text)
-
 def get_local_img_as_base64(file_path):
     if not os.path.exists(file_path):
         st.error(f"Logo file not found at {file_path}")
@@ -457,8 +450,11 @@ st.set_page_config(
 )
 
 # Initialize session state with advanced features
-if 'summary_history' not in st.session_state:
-    st.session_state.summary_history = []
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 1
+if 'session_id' not in st.session_state:
+    # Owns this browser session's history when no API key is entered
+    st.session_state.session_id = uuid.uuid4().hex
 if 'processing_time' not in st.session_state:
     st.session_state.processing_time = 0
 if 'theme' not in st.session_state:
@@ -472,6 +468,68 @@ if 'analytics' not in st.session_state:
         'usage_by_day': []
     }
 
+# Summarization engine and its caches
+@st.cache_resource
+def get_pipeline():
+    # Shared across reruns and sessions so the in-memory caches are reused
+    return SummarizationPipeline(
+        summary_cache=SummaryCache.default(),
+        loader_cache=LoaderCache.default(),
+        duplicate_index=DuplicateIndex.default()
+    )
+
+pipeline = get_pipeline()
+
+# Summary history persists in SQLite, one history per API key (or browser session); only the rows being shown are loaded
+HISTORY_PAGE_SIZE = 10
+
+@st.cache_resource
+def get_history():
+    return HistoryStore.default()
+
+history = get_history()
+
+# Dashboard figures are rebuilt only when the owner's history version changes, not on every rerun
+@st.cache_resource(max_entries=16)
+def usage_figure(_history, owner, version):
+    df = pd.DataFrame(_history.usage_by_day(owner), columns=['Date', 'Count'])
+    fig = px.line(df, x='Date', y='Count', title='Usage Over Time')
+    fig.update_layout(height=200, showlegend=False)
+    return fig
+
+@st.cache_resource(max_entries=32)
+def model_usage_figure(_history, owner, version, title, height=None):
+    model_counts = dict(_history.model_counts(owner))
+    fig = px.pie(
+        values=list(model_counts.values()),
+        names=list(model_counts.keys()),
+        title=title
+    )
+    if height is not None:
+        fig.update_layout(height=height, showlegend=False)
+    return fig
+
+@st.cache_resource(max_entries=16)
+def processing_time_figure(_history, owner, version):
+    timestamps, times = zip(*_history.processing_times(owner))
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=timestamps,
+        y=times,
+        mode='lines+markers',
+        name='Processing Time',
+        line=dict(color='#4ade80')
+    ))
+    
+    fig.update_layout(
+        title='Processing Time Trend',
+        xaxis_title='Time',
+        yaxis_title='Processing Time (seconds)',
+        height=300
+    )
+    return fig
+
 # Advanced header with animations
 img_base64 = get_local_img_as_base64("youtube_logo.png")
 if img_base64:
@@ -515,34 +573,30 @@ with st.sidebar:
         placeholder="Enter your Groq API key...",
         help="Get your free API key from https://console.groq.com/"
     )
+    history_owner_id = history_owner(groq_api_key.strip(), st.session_state.session_id)
+    history_stats = history.stats(history_owner_id)
     
     st.markdown("---")
     
     # Advanced model selection
     st.markdown("### 🤖 AI Model Configuration")
     
-    model_options = {
-        "gemma2-9b-it": "🔥 Gemma 2 9B (Recommended)",
-        "llama3-8b-8192": "🦙 Llama 3 8B (Fast)",
-        "mixtral-8x7b-32768": "🌟 Mixtral 8x7B (Advanced)",
-        "llama3-70b-8192": "🚀 Llama 3 70B (Premium)"
-    }
-    
     selected_model = st.selectbox(
         "Model Selection",
         options=list(model_options.keys()),
+        index=list(model_options.keys()).index(DEFAULT_MODEL),
         format_func=lambda x: model_options[x],
-        help="Different models offer varying performance and capabilities"
+        help="Different models offer varying performance and capabilities. Auto picks the fastest model whose context window and per-minute token limit fit the content; TextRank runs offline without an API key."
     )
     
-    # Model performance info
-    model_info = {
-        "gemma2-9b-it": {"speed": "⚡ Fast", "quality": "🎯 High", "tokens": "8K"},
-        "llama3-8b-8192": {"speed": "🚀 Very Fast", "quality": "✅ Good", "tokens": "8K"},
-        "mixtral-8x7b-32768": {"speed": "⚡ Fast", "quality": "🌟 Excellent", "tokens": "32K"},
-        "llama3-70b-8192": {"speed": "🐌 Slow", "quality": "🏆 Premium", "tokens": "8K"}
-    }
+    # Check the choice against what the key can actually use (memoized per key)
+    accessible_models = None
+    if groq_api_key.strip():
+        accessible_models = available_models(groq_api_key)
+        if accessible_models and selected_model != AUTO_MODEL and selected_model not in LOCAL_MODELS and selected_model not in accessible_models:
+            st.warning(f"⚠️ This API key does not have access to {selected_model}")
     
+    # Model performance info
     if selected_model in model_info:
         info = model_info[selected_model]
         st.markdown(f"""
@@ -551,6 +605,13 @@ with st.sidebar:
         - Quality: {info['quality']}
         - Context: {info['tokens']} tokens
         """)
+    elif selected_model in LOCAL_MODELS:
+        st.markdown("""
+        **Model Info:**
+        - Speed: ⚡ Instant (runs locally)
+        - Quality: 📑 Extractive (sentences from the source)
+        - Context: Unlimited, no API key needed
+        """)
     
     st.markdown("---")
     
@@ -560,44 +621,24 @@ with st.sidebar:
     # Summary type selection
     summary_type = st.selectbox(
         "Summary Type",
-        [
-            "📋 Standard Summary",
-            "🎯 Executive Summary",
-            "📖 Detailed Analysis",
-            "🔍 Key Points Only",
-            "💡 Insights & Takeaways",
-            "📊 Structured Report"
-        ],
+        summary_types,
         help="Choose the type of summary you want"
     )
     
     # Summary length
     summary_length = st.selectbox(
         "Summary Length",
-        ["Short (100-200 words)", "Medium (200-400 words)", "Long (400-600 words)", "Extended (600-800 words)", "Custom"],
+        summary_lengths,
         index=1
     )
     
     if summary_length == "Custom":
         custom_length = st.number_input("Custom word count", min_value=50, max_value=1000, value=300)
-        word_count = custom_length
+        word_count = word_count_for_length(summary_length, custom_length)
     else:
-        word_count = int(summary_length.split("(")[1].split("-")[0])
+        word_count = word_count_for_length(summary_length)
     
     # Language selection with more options
-    language_options = {
-        "English": "en",
-        "Türkçe": "tr",
-        "Español": "es",
-        "Français": "fr",
-        "Deutsch": "de",
-        "Italiano": "it",
-        "Português": "pt",
-        "日本語": "ja",
-        "한국어": "ko",
-        "中文": "zh"
-    }
-    
     selected_language = st.selectbox(
         "🌍 Output Language",
         options=list(language_options.keys()),
@@ -612,15 +653,18 @@ with st.sidebar:
     enable_readability = st.checkbox("📚 Readability Score", value=True)
     enable_wordcloud = st.checkbox("☁️ Word Cloud", value=True)
     
+    stream_output = st.checkbox("⚡ Stream Summary", value=True, help="Show the summary as it is being generated")
+    extractive = st.checkbox("✂️ Extractive Pre-compression", value=False, help="For long content, send only the most central and diverse sentences to the model (runs a local embedding model on CPU)")
+    
     st.markdown("---")
     
     # Statistics dashboard
-    if st.session_state.summary_history:
+    if history_stats['total_summaries']:
         st.markdown("### 📊 Dashboard")
         
         # Quick stats
-        total_summaries = len(st.session_state.summary_history)
-        avg_time = sum(s.get('processing_time', 0) for s in st.session_state.summary_history) / total_summaries
+        total_summaries = history_stats['total_summaries']
+        avg_time = history_stats['average_processing_time']
         
         col1, col2 = st.columns(2)
         with col1:
@@ -628,30 +672,15 @@ with st.sidebar:
         with col2:
             st.metric("⏱️ Avg Time", f"{avg_time:.1f}s")
         
+        loader_stats = pipeline.loader_cache.stats()
+        st.caption(f"📦 Loader cache: {loader_stats['hits']} hits / {loader_stats['misses']} misses / {loader_stats['revalidated']} revalidated")
+        
         # Usage chart
-        if len(st.session_state.summary_history) > 1:
-            dates = [datetime.strptime(s['timestamp'], "%Y-%m-%d %H:%M:%S").date() 
-                    for s in st.session_state.summary_history]
-            date_counts = Counter(dates)
-            
-            if date_counts:
-                df = pd.DataFrame(list(date_counts.items()), columns=['Date', 'Count'])
-                fig = px.line(df, x='Date', y='Count', title='Usage Over Time')
-                fig.update_layout(height=200, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
+        if total_summaries > 1:
+            st.plotly_chart(usage_figure(history, history_owner_id, history_stats['version']), use_container_width=True)
         
         # Model usage
-        models = [s.get('model', 'Unknown') for s in st.session_state.summary_history]
-        model_counts = Counter(models)
-        
-        if model_counts:
-            fig = px.pie(
-                values=list(model_counts.values()),
-                names=list(model_counts.keys()),
-                title='Model Usage'
-            )
-            fig.update_layout(height=250, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(model_usage_figure(history, history_owner_id, history_stats['version'], 'Model Usage', 250), use_container_width=True)
 
 # Main content area with enhanced layout
 col1, col2 = st.columns([3, 1])
@@ -660,7 +689,7 @@ with col1:
     st.markdown("### 🔗 Content Source")
     
     # Source type tabs
-    tab1, tab2, tab3 = st.tabs(["🌐 URL", "📚 Wikipedia", "📝 Direct Text"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🌐 URL", "📚 Wikipedia", "📝 Direct Text", "📄 Upload File"])
     
     with tab1:
         generic_url = st.text_input(
@@ -715,6 +744,16 @@ with col1:
             height=150,
             help="Enter any text directly for summarization"
         )
+    
+    with tab4:
+        uploaded_file = st.file_uploader(
+            "Upload a document",
+            type=[ext.lstrip(".") for ext in SUPPORTED_EXTENSIONS],
+            help="PDF, TXT or Markdown; long reports are read page by page"
+        )
+        
+        if uploaded_file is not None:
+            st.info(f"📄 Ready to summarize: **{uploaded_file.name}** ({uploaded_file.size / 1024 / 1024:.1f} MB)")
 
 with col2:
     st.markdown("### 🎯 Quick Actions")
@@ -756,285 +795,97 @@ with col2:
 st.markdown("---")
 
 # Main action button with enhanced styling
-def check_groq_api_key(api_key):
-    if not api_key or not isinstance(api_key, str) or "gsk_" not in api_key:
-        return False
-    try:
-        response = requests.get("https://api.groq.com/openai/v1/models", headers={"Authorization": f"Bearer {api_key}"})
-        return response.status_code == 200
-    except requests.exceptions.RequestException:
-        return False
+
+stage_messages = {
+    "validate": "🤖 <span class='loading-text'>Initializing AI model...</span>",
+    "load": "📥 <span class='loading-text'>Loading content...</span>",
+    "compress": "✂️ <span class='loading-text'>Selecting key sentences...</span>",
+    "chain": "🧠 <span class='loading-text'>Analyzing content with AI...</span>",
+    "analyze": "🔬 <span class='loading-text'>Running content analysis...</span>",
+    "done": "✅ <span class='loading-text'>Analysis complete!</span>",
+}
 
 if st.button("🚀 Generate AI Summary", type="primary", use_container_width=True):
-    # Input validation
-    content_source = None
-    if generic_url and validators.url(generic_url):
-        content_source = ("url", generic_url)
-    elif wikipedia_query:
-        content_source = ("wikipedia", wikipedia_query)
-    elif direct_text:
-        content_source = ("text", direct_text)
-    
-    if not groq_api_key.strip() or not check_groq_api_key(groq_api_key):
+    # Input validation; an upload is only copied to disk once it is known to be the source
+    content_source = resolve_source(url=generic_url, wikipedia_query=wikipedia_query, text=direct_text,
+                                    file_path=uploaded_file.name if uploaded_file is not None else None)
+    
+    if not groq_api_key.strip() and selected_model not in LOCAL_MODELS:
         st.error("🔑 Please provide a valid Groq API key.")
     elif not content_source:
         st.error("🔗 Please provide content to summarize")
     else:
         try:
-            start_time = time.time()
-            
             # Enhanced progress display
             progress_container = st.container()
             with progress_container:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                # Initialize AI model
-                status_text.markdown("🤖 <span class='loading-text'>Initializing AI model...</span>", unsafe_allow_html=True)
-                progress_bar.progress(10)
-                
-                llm = ChatGroq(model=selected_model, groq_api_key=groq_api_key)
-                
-                # Enhanced prompt based on summary type
-                prompt_templates = {
-                    "📋 Standard Summary": """
-                    Create a comprehensive summary of the following content in {word_count} words in {language}.
-                    
-                    Structure:
-                    1. **Overview**: Brief introduction to the main topic
-                    2. **Key Points**: Most important information and details
-                    3. **Conclusion**: Final thoughts and takeaways
-                    
-                    Content: {text}
-                    """,
-                    "🎯 Executive Summary": """
-                    Create an executive summary of the following content in {word_count} words in {language}.
-                    Focus on key business insights, decisions, and strategic points.
-                    
-                    Structure:
-                    1. **Executive Overview**: High-level summary for decision makers
-                    2. **Key Findings**: Most critical insights and data
-                    3. **Recommendations**: Actionable next steps
-                    
-                    Content: {text}
-                    """,
-                    "📖 Detailed Analysis": """
-                    Provide a detailed analysis of the following content in {word_count} words in {language}.
-                    Include thorough examination of all major points and their implications.
-                    
-                    Structure:
-                    1. **Introduction**: Context and background
-                    2. **Detailed Analysis**: Comprehensive breakdown of key elements
-                    3. **Implications**: What this means and potential impact
-                    
-                    Content: {text}
-                    """,
-                    "🔍 Key Points Only": """
-                    Extract and present only the most important key points from the following content in {word_count} words in {language}.
-                    Focus on actionable insights and critical information.
-                    
-                    Format as numbered list:
-                    1. **Point 1**: Brief but comprehensive explanation
-                    2. **Point 2**: Brief but comprehensive explanation
-                    [Continue for all key points]
-                    
-                    Content: {text}
-                    """,
-                    "💡 Insights & Takeaways": """
-                    Provide key insights and actionable takeaways from the following content in {word_count} words in {language}.
-                    Focus on what readers should learn and how they can apply this information.
-                    
-                    Structure:
-                    1. **Key Insights**: Most important discoveries and learnings
-                    2. **Actionable Takeaways**: Practical steps and applications
-                    3. **Future Implications**: What this means going forward
-                    
-                    Content: {text}
-                    """,
-                    "📊 Structured Report": """
-                    Create a structured report of the following content in {word_count} words in {language}.
-                    Present information in a professional, organized manner.
-                    
-                    Structure:
-                    1. **Executive Summary**: Brief overview
-                    2. **Main Findings**: Detailed breakdown
-                    3. **Data Points**: Key statistics and facts
-                    4. **Conclusions**: Final analysis and recommendations
-                    
-                    Content: {text}
-                    """
-                }
-                
-                selected_prompt = prompt_templates.get(summary_type, prompt_templates["📋 Standard Summary"])
-                
-                prompt = PromptTemplate(
-                    template=selected_prompt,
-                    input_variables=["text", "word_count", "language"]
-                )
-                
-                # Load content based on source
-                status_text.markdown("📥 <span class='loading-text'>Loading content...</span>", unsafe_allow_html=True)
-                progress_bar.progress(30)
-                
-                docs = []
-                content_info = {}
-                
-                if content_source[0] == "url":
-                    url = content_source[1]
-                    try:
-                        if "youtube.com" in url or "youtu.be" in url:
-                            loader = YoutubeLoader.from_youtube_url(
-                                url,
-                                add_video_info=False,
-                                language=["en", "en-GB", "id", "de", "es", "fr", "it", "ja", "ko", "pt", "ru", "tr"]
-                            )
-                            content_info['type'] = 'YouTube Video'
-                            content_info['source'] = url
-                        else:
-                            loader = UnstructuredURLLoader(
-                                urls=[url],
-                                ssl_verify=False,
-                                headers={
-                                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                                }
-                            )
-                            content_info['type'] = 'Website'
-                            content_info['source'] = url
-                        docs = loader.load()
-                    except Exception as e:
-                        st.error(f"❌ Failed to load content from URL: {e}")
-                        st.stop()
-
-                elif content_source[0] == "wikipedia":
-                    try:
-                        query = content_source[1]
-                        loader = WikipediaLoader(query=query, load_max_docs=1)
-                        docs = loader.load()
-                        content_info['type'] = 'Wikipedia Article'
-                        content_info['source'] = f"Wikipedia: {query}"
-                    except Exception as e:
-                        st.error(f"❌ Failed to load content from Wikipedia: {e}")
-                        st.stop()
-
-                elif content_source[0] == "text":
-                    # Create a document from direct text
-                    from langchain.schema import Document
-                    docs = [Document(page_content=content_source[1])]
-                    content_info['type'] = 'Direct Text'
-                    content_info['source'] = 'User Input'
-                
-                progress_bar.progress(50)
-                
-                # Process content with AI
-                status_text.markdown("🧠 <span class='loading-text'>Analyzing content with AI...</span>", unsafe_allow_html=True)
-                progress_bar.progress(70)
-                
-                # Enhanced chain with custom prompt
-                formatted_prompt = prompt.format(
-                    text="{text}",
-                    word_count=word_count,
-                    language=selected_language
-                )
-                
-                chain = load_summarize_chain(
-                    llm,
-                    chain_type="stuff",
-                    prompt=PromptTemplate(template=formatted_prompt, input_variables=["text"])
-                )
-                
-                output_summary = chain.run(docs)
-                
-                progress_bar.progress(90)
-                
-                # Advanced content analysis
-                analysis_results = {}
-                original_text = " ".join([doc.page_content for doc in docs])
-                
-                if enable_sentiment:
-                    # Simple sentiment analysis
-                    positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive', 'success', 'win', 'best']
-                    negative_words = ['bad', 'terrible', 'awful', 'horrible', 'negative', 'failure', 'lose', 'worst', 'problem', 'issue']
-                    
-                    text_lower = original_text.lower()
-                    pos_count = sum(1 for word in positive_words if word in text_lower)
-                    neg_count = sum(1 for word in negative_words if word in text_lower)
-                    
-                    if pos_count > neg_count:
-                        sentiment = "Positive"
-                        sentiment_class = "sentiment-positive"
-                    elif neg_count > pos_count:
-                        sentiment = "Negative"  
-                        sentiment_class = "sentiment-negative"
-                    else:
-                        sentiment = "Neutral"
-                        sentiment_class = "sentiment-neutral"
-                    
-                    analysis_results['sentiment'] = {'score': sentiment, 'class': sentiment_class}
+                def report_progress(stage, percent):
+                    if stage in stage_messages:
+                        status_text.markdown(stage_messages[stage], unsafe_allow_html=True)
+                    progress_bar.progress(percent)
                 
-                if enable_keywords:
-                    # Extract keywords using simple frequency analysis
-                    import re
-                    from collections import Counter
-                    
-                    # Clean text and extract words
-                    clean_text = re.sub(r'[^\w\s]', '', original_text.lower())
-                    words = clean_text.split()
-                    
-                    # Remove common stop words
-                    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-                    
-                    filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
-                    word_freq = Counter(filtered_words)
-                    
-                    analysis_results['keywords'] = word_freq.most_common(10)
+                stream_placeholder = st.empty()
+                streamed_parts = []
+                last_render = [0.0]
                 
-                if enable_readability:
-                    # Calculate readability scores
-                    try:
-                        flesch_score = flesch_reading_ease(original_text)
-                        fk_grade = flesch_kincaid_grade(original_text)
-                        
-                        if flesch_score >= 90:
-                            readability_level = "Very Easy"
-                        elif flesch_score >= 80:
-                            readability_level = "Easy"
-                        elif flesch_score >= 70:
-                            readability_level = "Fairly Easy"
-                        elif flesch_score >= 60:
-                            readability_level = "Standard"
-                        elif flesch_score >= 50:
-                            readability_level = "Fairly Difficult"
-                        elif flesch_score >= 30:
-                            readability_level = "Difficult"
-                        else:
-                            readability_level = "Very Difficult"
-                        
-                        analysis_results['readability'] = {
-                            'flesch_score': flesch_score,
-                            'grade_level': fk_grade,
-                            'level': readability_level
-                        }
-                    except:
-                        analysis_results['readability'] = {'error': 'Could not calculate readability'}
+                def render_token(text):
+                    streamed_parts.append(text)
+                    # Redrawing markdown per token is costly; refresh at most ~20 times a second
+                    now = time.perf_counter()
+                    if now - last_render[0] >= 0.05:
+                        last_render[0] = now
+                        stream_placeholder.markdown(f"### 📋 {summary_type} Summary\n\n" + "".join(streamed_parts) + " ▌")
                 
-                if enable_wordcloud:
-                    # Generate word cloud data
-                    if 'keywords' in analysis_results:
-                        wordcloud_data = dict(analysis_results['keywords'])
-                        analysis_results['wordcloud'] = wordcloud_data
+                if content_source.kind == "file":
+                    # On disk so the pipeline can memory-map it instead of holding another copy; removed right after the run
+                    content_source = ContentSource("file", save_upload(uploaded_file, uploaded_file.name))
                 
-                progress_bar.progress(100)
-                status_text.markdown("✅ <span class='loading-text'>Analysis complete!</span>", unsafe_allow_html=True)
+                try:
+                    result = pipeline.run(
+                        SummaryRequest(
+                            source=content_source,
+                            api_key=groq_api_key,
+                            model=selected_model,
+                            auto_models=accessible_models,
+                            extractive=extractive,
+                            summary_type=summary_type,
+                            word_count=word_count,
+                            language=selected_language,
+                            enable_sentiment=enable_sentiment,
+                            enable_keywords=enable_keywords,
+                            enable_readability=enable_readability,
+                            enable_wordcloud=enable_wordcloud
+                        ),
+                        progress=report_progress,
+                        on_token=render_token if stream_output else None
+                    )
+                except InvalidAPIKeyError:
+                    progress_bar.empty()
+                    status_text.empty()
+                    st.error("🔑 Please provide a valid Groq API key.")
+                    st.stop()
+                except SourceLoadError as e:
+                    st.error(f"❌ {e}")
+                    st.stop()
+                finally:
+                    if content_source.kind == "file":
+                        remove_upload(content_source.value)
                 
-                # Calculate processing time
-                end_time = time.time()
-                processing_time = end_time - start_time
+                output_summary = result.summary
+                content_info = result.content_info
+                analysis_results = result.analysis
+                processing_time = result.processing_time
+                compression_ratio = result.compression_ratio
                 st.session_state.processing_time = processing_time
                 
                 # Clear progress indicators
-                time.sleep(0.5)
                 progress_bar.empty()
                 status_text.empty()
+                stream_placeholder.empty()
+                render_start = time.perf_counter()
                 
                 # Display results with advanced styling
                 st.markdown("## 📊 Analysis Results")
@@ -1042,20 +893,30 @@ if st.button("🚀 Generate AI Summary", type="primary", use_container_width=Tru
                 # Summary metadata with enhanced cards
                 st.markdown('<div class="stats-grid">', unsafe_allow_html=True)
                 
-                col1, col2, col3, col4 = st.columns(4)
+                if result.time_to_first_token is not None:
+                    col1, col2, col3, col4, col5 = st.columns(5)
+                    with col5:
+                        st.markdown(f"""
+                        <div class="stats-card">
+                            <div class="stats-number">{result.time_to_first_token:.1f}s</div>
+                            <div class="stats-label">⚡ First Token</div>
+                        </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
                     st.markdown(f"""
                     <div class="stats-card">
                         <div class="stats-number">{processing_time:.1f}s</div>
-                        <div class="stats-label">⏱️ Processing Time</div>
+                        <div class="stats-label">{'⚡ Cached Result' if result.cache_hit else '⏱️ Processing Time'}</div>
                     </div>
                     """, unsafe_allow_html=True)
                 
                 with col2:
                     st.markdown(f"""
                     <div class="stats-card">
-                        <div class="stats-number">{len(output_summary.split())}</div>
+                        <div class="stats-number">{result.summary_words}</div>
                         <div class="stats-label">📝 Words Generated</div>
                     </div>
                     """, unsafe_allow_html=True)
@@ -1063,13 +924,12 @@ if st.button("🚀 Generate AI Summary", type="primary", use_container_width=Tru
                 with col3:
                     st.markdown(f"""
                     <div class="stats-card">
-                        <div class="stats-number">{len(original_text.split())}</div>
+                        <div class="stats-number">{result.original_words}</div>
                         <div class="stats-label">📄 Original Words</div>
                     </div>
                     """, unsafe_allow_html=True)
                 
                 with col4:
-                    compression_ratio = (len(original_text.split()) / len(output_summary.split())) if output_summary else 0
                     st.markdown(f"""
                     <div class="stats-card">
                         <div class="stats-number">{compression_ratio:.1f}x</div>
@@ -1079,6 +939,9 @@ if st.button("🚀 Generate AI Summary", type="primary", use_container_width=Tru
                 
                 st.markdown('</div>', unsafe_allow_html=True)
                 
+                if result.routing:
+                    st.caption(f"🧭 Auto model: {model_options[result.model]} — {result.routing['reason']}")
+                
                 # Main summary display
                 # We split the rendering into three parts to ensure Streamlit
                 # correctly parses the markdown from the summary.
@@ -1231,6 +1094,23 @@ if st.button("🚀 Generate AI Summary", type="primary", use_container_width=Tru
                                     
                                     st.plotly_chart(fig, use_container_width=True)
                 
+                # Rendering is traced too, so refresh the exports before offering them
+                result.trace.record("render", render_start)
+                pipeline.export(result)
+                
+                with st.expander("⏱️ Timings"):
+                    timings_df = pd.DataFrame([
+                        {
+                            'Stage': span['name'],
+                            'Parent': span['parent'] or "",
+                            'Start (s)': round(span['start'], 3),
+                            'Duration (s)': round(span['duration'], 3),
+                            'Details': ", ".join(f"{k}={v}" for k, v in span['attributes'].items())
+                        }
+                        for span in result.spans
+                    ])
+                    st.dataframe(timings_df, use_container_width=True, hide_index=True)
+                
                 # Enhanced export options
                 st.markdown("### 💾 Export & Share")
                 
@@ -1238,36 +1118,9 @@ if st.button("🚀 Generate AI Summary", type="primary", use_container_width=Tru
                 
                 with col1:
                     # Enhanced text export
-                    export_text = f"""
-AI Content Summary Report
-========================
-
-SOURCE INFORMATION:
-- Type: {content_info['type']}
-- Source: {content_info['source']}
-- Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-- Model: {selected_model}
-- Language: {selected_language}
-- Summary Type: {summary_type}
-
-PROCESSING METRICS:
-- Processing Time: {processing_time:.1f} seconds
-- Original Words: {len(original_text.split())}
-- Summary Words: {len(output_summary.split())}
-- Compression Ratio: {compression_ratio:.1f}x
-
-SUMMARY:
-{output_summary}
-
-ANALYSIS RESULTS:
-{json.dumps(analysis_results, indent=2) if analysis_results else 'No analysis performed'}
-
-Generated by AI Content Summarizer Pro
-"""
-                    
                     st.download_button(
                         label="📄 Download Report",
-                        data=export_text,
+                        data=result.export_text,
                         file_name=f"summary_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
                         mime="text/plain",
                         use_container_width=True
@@ -1275,22 +1128,9 @@ Generated by AI Content Summarizer Pro
                 
                 with col2:
                     # JSON export
-                    export_json = {
-                        'summary': output_summary,
-                        'metadata': {
-                            'source': content_info,
-                            'processing_time': processing_time,
-                            'model': selected_model,
-                            'language': selected_language,
-                            'summary_type': summary_type,
-                            'timestamp': datetime.now().isoformat()
-                        },
-                        'analysis': analysis_results
-                    }
-                    
                     st.download_button(
                         label="📊 Download JSON",
-                        data=json.dumps(export_json, indent=2),
+                        data=json.dumps(result.export_json, indent=2),
                         file_name=f"summary_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                         mime="application/json",
                         use_container_width=True
@@ -1302,22 +1142,11 @@ Generated by AI Content Summarizer Pro
                         st.info("🔗 Share functionality would integrate with social media APIs")
                 
                 # Add to enhanced history
-                st.session_state.summary_history.append({
-                    'summary': output_summary,
-                    'content_info': content_info,
-                    'processing_time': processing_time,
-                    'model': selected_model,
-                    'language': selected_language,
-                    'summary_type': summary_type,
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'analysis': analysis_results,
-                    'word_count': len(output_summary.split()),
-                    'compression_ratio': compression_ratio
-                })
+                history.add(history_owner_id, result.to_history_entry())
                 
                 # Update analytics
                 st.session_state.analytics['total_summaries'] += 1
-                st.session_state.analytics['total_words_processed'] += len(original_text.split())
+                st.session_state.analytics['total_words_processed'] += result.original_words
                 
                 st.success("🎉 Summary and analysis completed successfully!")
                 
@@ -1326,7 +1155,8 @@ Generated by AI Content Summarizer Pro
             st.info("💡 Please check your API key and try again")
 
 # Enhanced history section
-if st.session_state.summary_history:
+history_stats = history.stats(history_owner_id)
+if history_stats['total_summaries']:
     st.markdown("---")
     st.markdown("## 📚 Summary History & Analytics")
     
@@ -1334,14 +1164,14 @@ if st.session_state.summary_history:
     history_tab1, history_tab2 = st.tabs(["📊 Analytics Dashboard", "📋 History"])
     
     with history_tab1:
-        if len(st.session_state.summary_history) > 0:
+        if history_stats['total_summaries'] > 0:
             # Performance metrics
             col1, col2, col3, col4 = st.columns(4)
             
-            total_summaries = len(st.session_state.summary_history)
-            avg_processing_time = sum(s.get('processing_time', 0) for s in st.session_state.summary_history) / total_summaries
-            total_words = sum(s.get('word_count', 0) for s in st.session_state.summary_history)
-            avg_compression = sum(s.get('compression_ratio', 0) for s in st.session_state.summary_history) / total_summaries
+            total_summaries = history_stats['total_summaries']
+            avg_processing_time = history_stats['average_processing_time']
+            total_words = history_stats['total_words']
+            avg_compression = history_stats['average_compression']
             
             with col1:
                 st.metric("📊 Total Summaries", total_summaries)
@@ -1353,45 +1183,23 @@ if st.session_state.summary_history:
                 st.metric("🗜️ Avg Compression", f"{avg_compression:.1f}x")
             
             # Usage trends
-            if len(st.session_state.summary_history) > 1:
+            if total_summaries > 1:
                 # Processing time trend
-                times = [s.get('processing_time', 0) for s in st.session_state.summary_history]
-                timestamps = [s['timestamp'] for s in st.session_state.summary_history]
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=timestamps,
-                    y=times,
-                    mode='lines+markers',
-                    name='Processing Time',
-                    line=dict(color='#4ade80')
-                ))
-                
-                fig.update_layout(
-                    title='Processing Time Trend',
-                    xaxis_title='Time',
-                    yaxis_title='Processing Time (seconds)',
-                    height=300
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(processing_time_figure(history, history_owner_id, history_stats['version']), use_container_width=True)
                 
                 # Model usage distribution
-                models = [s.get('model', 'Unknown') for s in st.session_state.summary_history]
-                model_counts = Counter(models)
-                
-                fig2 = px.pie(
-                    values=list(model_counts.values()),
-                    names=list(model_counts.keys()),
-                    title='Model Usage Distribution'
-                )
-                
-                st.plotly_chart(fig2, use_container_width=True)
+                st.plotly_chart(model_usage_figure(history, history_owner_id, history_stats['version'], 'Model Usage Distribution'), use_container_width=True)
     
     with history_tab2:
-        # Enhanced history display
-        for i, entry in enumerate(reversed(st.session_state.summary_history[-10:])):
-            with st.expander(f"📝 {entry['timestamp']} - {entry['content_info']['type']}"):
+        # Enhanced history display, one page at a time
+        page_count = max(1, -(-history_stats['total_summaries'] // HISTORY_PAGE_SIZE))
+        st.session_state.history_page = min(st.session_state.history_page, page_count)
+        if page_count > 1:
+            st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key='history_page')
+        history_page = history.page(history_owner_id, (st.session_state.history_page - 1) * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE)
+        for i, entry in enumerate(history_page):
+            cache_badge = " ⚡" if entry.get('cache_hit') else ""
+            with st.expander(f"📝 {entry['timestamp']} - {entry['content_info']['type']}{cache_badge}"):
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
@@ -1405,15 +1213,30 @@ if st.session_state.summary_history:
                     st.markdown(f"- **Language:** {entry['language']}")
                     st.markdown(f"- **Type:** {entry['summary_type']}")
                     st.markdown(f"- **Processing Time:** {entry['processing_time']:.1f}s")
+                    if entry.get('time_to_first_token') is not None:
+                        st.markdown(f"- **First Token:** {entry['time_to_first_token']:.1f}s")
                     st.markdown(f"- **Word Count:** {entry['word_count']}")
                     st.markdown(f"- **Compression:** {entry['compression_ratio']:.1f}x")
+                    st.markdown(f"- **Cache:** {'⚡ Hit' if entry.get('cache_hit') else 'Miss'}")
+                    if entry.get('near_duplicate'):
+                        st.markdown(f"- **Near-Duplicate:** {entry['near_duplicate']['similarity']:.0%} similar to an earlier source")
+                    if entry.get('routing'):
+                        st.markdown(f"- **Routing:** Auto → {entry['routing']['model']} ({entry['routing']['reason']})")
+                    if entry.get('compression'):
+                        st.markdown(f"- **Extractive:** {entry['compression']['original_tokens']} → {entry['compression']['compressed_tokens']} tokens")
+                    if entry.get('chain') and entry['chain']['chain_type'] == "textrank":
+                        st.markdown(f"- **Chain:** textrank ({entry['chain']['selected_sentences']} of {entry['chain']['sentences']} sentences)")
+                    elif entry.get('chain'):
+                        st.markdown(f"- **Chain:** {entry['chain']['chain_type']} ({entry['chain']['chunk_count']} chunks, {entry['chain']['token_count']} tokens, {entry['chain'].get('cached_chunks', 0)} chunk summaries reused)")
+                    if entry.get('timings'):
+                        st.markdown("- **Timings:** " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in entry['timings'].items()))
         
         # History management
         col1, col2 = st.columns(2)
         
         with col1:
             if st.button("🗑️ Clear History", use_container_width=True):
-                st.session_state.summary_history = []
+                history.clear(history_owner_id)
                 st.session_state.analytics = {
                     'total_summaries': 0,
                     'total_words_processed': 0,
@@ -1426,7 +1249,7 @@ if st.session_state.summary_history:
         
         with col2:
             if st.button("💾 Export History", use_container_width=True):
-                history_json = json.dumps(st.session_state.summary_history, indent=2)
+                history_json = json.dumps(list(history.iter_entries(history_owner_id)), indent=2)
                 st.download_button(
                     label="📁 Download History",
                     data=history_json,
@@ -0,0 +1,33 @@
+"""Headless summarization engine shared by main.py, app.py and batch drivers."""
+
+import importlib
+
+# Public names are imported on first use so CLI invocations only pay for what they touch
+_exports = {
+    "ContentSource": "summarizer.sources",
+    "DuplicateIndex": "summarizer.dedup",
+    "HistoryStore": "summarizer.history",
+    "InvalidAPIKeyError": "summarizer.exceptions",
+    "LLMScheduler": "summarizer.scheduler",
+    "LoaderCache": "summarizer.loader_cache",
+    "SourceLoadError": "summarizer.exceptions",
+    "SummarizationPipeline": "summarizer.pipeline",
+    "SummarizerError": "summarizer.exceptions",
+    "SummaryCache": "summarizer.cache",
+    "SummaryRequest": "summarizer.pipeline",
+    "SummaryResult": "summarizer.pipeline",
+    "Tracer": "summarizer.timing",
+    "add_span_listener": "summarizer.timing",
+    "remove_span_listener": "summarizer.timing",
+    "resolve_source": "summarizer.sources",
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module 'summarizer' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
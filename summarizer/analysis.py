@@ -0,0 +1,190 @@
+import re
+from collections import Counter
+
+from summarizer.timing import maybe_span
+
+positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive', 'success', 'win', 'best']
+negative_words = ['bad', 'terrible', 'awful', 'horrible', 'negative', 'failure', 'lose', 'worst', 'problem', 'issue']
+
+stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
+
+
+_punctuation_re = re.compile(r'[^\w\s]')
+_vowel_groups_re = re.compile(r'[aeiouy]+')
+
+# Upper bound on the text held at once when streaming documents through TextStats
+TEXT_CHUNK_CHARS = 1 << 20
+
+positive_set = frozenset(positive_words)
+negative_set = frozenset(negative_words)
+
+
+def iter_text_chunks(docs, chunk_chars=TEXT_CHUNK_CHARS):
+    """Yield the documents' text in pieces of at most ~chunk_chars, cut on whitespace."""
+    for doc in docs:
+        text = doc.page_content
+        start = 0
+        while len(text) - start > chunk_chars:
+            end = text.rfind(" ", start, start + chunk_chars)
+            if end <= start:
+                # No space in the window (e.g. one giant token); cut at the next one
+                end = text.find(" ", start + chunk_chars)
+                if end == -1:
+                    break
+            yield text[start:end]
+            start = end + 1
+        yield text[start:]
+
+
+def count_syllables(word):
+    # Vowel-group heuristic with a silent trailing "e", close to textstat's estimate
+    groups = len(_vowel_groups_re.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+class TextStats:
+    """Everything the analyses need, from a single tokenization of the text.
+
+    Text is fed in chunks; each chunk is split once and counted with a
+    Counter, then punctuation stripping and sentence ends are handled per
+    distinct token and folded into running counters. Memory therefore scales
+    with the vocabulary, not the length of the transcript, and sentiment,
+    keywords, syllables and the word cloud are all read off those counters.
+    """
+
+    def __init__(self, text=None):
+        self.counts = Counter()
+        self.word_count = 0
+        self._sentence_ends = 0
+        self._syllable_count = None
+        if text:
+            self.update(text)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        stats = cls()
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    @classmethod
+    def from_documents(cls, docs, chunk_chars=None):
+        return cls.from_chunks(iter_text_chunks(docs, chunk_chars or TEXT_CHUNK_CHARS))
+
+    def update(self, text):
+        # Chunks must end on whitespace (see iter_text_chunks) so no word is split
+        counts = self.counts
+        for token, n in Counter(text.lower().split()).items():
+            # A token ending in . ! or ? ends a sentence
+            if token[-1] in ".!?":
+                self._sentence_ends += n
+            # Stripping punctuation never adds or removes whitespace, so doing it
+            # per token gives the same words as cleaning the whole text first
+            word = _punctuation_re.sub('', token) if not token.isalnum() else token
+            if word:
+                counts[word] += n
+                self.word_count += n
+        self._syllable_count = None
+
+    @property
+    def sentence_count(self):
+        return max(1, self._sentence_ends)
+
+    @property
+    def syllable_count(self):
+        # Per distinct word, so a long transcript costs its vocabulary size, not its length
+        if self._syllable_count is None:
+            self._syllable_count = sum(count_syllables(word) * n for word, n in self.counts.items())
+        return self._syllable_count
+
+    def top_words(self, n=10):
+        # most_common over the filtered vocabulary matches ranking the filtered word list
+        return Counter({
+            word: count for word, count in self.counts.items()
+            if len(word) > 2 and word not in stop_words
+        }).most_common(n)
+
+
+def flesch_reading_ease(stats):
+    words = stats.word_count
+    return round(206.835 - 1.015 * (words / stats.sentence_count) - 84.6 * (stats.syllable_count / words), 2)
+
+
+def flesch_kincaid_grade(stats):
+    words = stats.word_count
+    return round(0.39 * (words / stats.sentence_count) + 11.8 * (stats.syllable_count / words) - 15.59, 2)
+
+
+def readability_level(flesch_score):
+    if flesch_score >= 90:
+        return "Very Easy"
+    elif flesch_score >= 80:
+        return "Easy"
+    elif flesch_score >= 70:
+        return "Fairly Easy"
+    elif flesch_score >= 60:
+        return "Standard"
+    elif flesch_score >= 50:
+        return "Fairly Difficult"
+    elif flesch_score >= 30:
+        return "Difficult"
+    return "Very Difficult"
+
+
+def analyze_sentiment(stats):
+    # Simple sentiment analysis: how many lexicon words appear at all, as whole words so "win" no longer matches "window"
+    counts = stats.counts
+    pos_count = sum(1 for word in positive_set if word in counts)
+    neg_count = sum(1 for word in negative_set if word in counts)
+
+    if pos_count > neg_count:
+        return {'score': "Positive", 'class': "sentiment-positive"}
+    elif neg_count > pos_count:
+        return {'score': "Negative", 'class': "sentiment-negative"}
+    return {'score': "Neutral", 'class': "sentiment-neutral"}
+
+
+def extract_keywords(stats, top_n=10):
+    # Extract keywords using simple frequency analysis
+    return stats.top_words(top_n)
+
+
+def analyze_readability(stats):
+    if not stats.word_count:
+        return {'error': 'Could not calculate readability'}
+    flesch_score = flesch_reading_ease(stats)
+    return {
+        'flesch_score': flesch_score,
+        'grade_level': flesch_kincaid_grade(stats),
+        'level': readability_level(flesch_score)
+    }
+
+
+def analyze_content(original_text, sentiment=True, keywords=True, readability=True, wordcloud=True, tracer=None, stats=None):
+    # Pass ``stats`` (e.g. TextStats.from_documents) to analyze without materializing the text
+    analysis_results = {}
+
+    if stats is None:
+        with maybe_span(tracer, "tokenize_text"):
+            stats = TextStats(original_text)
+
+    if sentiment:
+        with maybe_span(tracer, "sentiment"):
+            analysis_results['sentiment'] = analyze_sentiment(stats)
+
+    if keywords:
+        with maybe_span(tracer, "keywords"):
+            analysis_results['keywords'] = extract_keywords(stats)
+
+    if readability:
+        with maybe_span(tracer, "readability"):
+            analysis_results['readability'] = analyze_readability(stats)
+
+    if wordcloud and 'keywords' in analysis_results:
+        # Generate word cloud data from the keywords, so it is only there when they are
+        with maybe_span(tracer, "wordcloud"):
+            analysis_results['wordcloud'] = dict(analysis_results['keywords'])
+
+    return analysis_results
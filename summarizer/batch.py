@@ -0,0 +1,171 @@
+"""Batch summarization over a CSV or JSONL list of sources.
+
+Usage:
+    python -m summarizer.batch sources.csv results.jsonl --workers 8
+
+Each input row needs one of ``url`` (or ``source``), ``wikipedia`` or ``text``
+and may override ``summary_type``, ``length``, ``language`` and ``model``.
+Results are appended to the output JSONL as they finish; re-running with the
+same output file skips rows that already succeeded.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from summarizer.config import DEFAULT_MODEL, DEFAULT_SUMMARY_TYPE, parse_length, parse_summary_type
+from summarizer.exceptions import SummarizerError
+from summarizer.sources import resolve_source
+
+
+def read_jobs(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    for row in rows:
+        row = {k: v for k, v in row.items() if v not in (None, "")}
+        row.setdefault('id', job_id(row))
+        yield row
+
+
+def job_id(row):
+    # Stable across runs so resuming works even if the input is reordered
+    return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def completed_ids(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write leaves a truncated last line
+                continue
+            if record.get('status') == "ok":
+                done.add(record['id'])
+    return done
+
+
+def build_request(row, api_key, defaults):
+    from summarizer.pipeline import SummaryRequest
+
+    source = resolve_source(
+        url=row.get('url') or row.get('source'),
+        wikipedia_query=row.get('wikipedia'),
+        text=row.get('text')
+    )
+    if source is None:
+        raise ValueError("Row has no usable url, wikipedia or text column")
+    return SummaryRequest(
+        source=source,
+        api_key=api_key,
+        model=row.get('model', defaults['model']),
+        summary_type=parse_summary_type(row.get('summary_type', defaults['summary_type'])),
+        word_count=parse_length(row.get('length'), defaults['word_count']),
+        language=row.get('language', defaults['language']),
+        enable_wordcloud=False
+    )
+
+
+class BatchRunner:
+    """Runs rows through a shared pipeline and streams results to a JSONL file.
+
+    Rows execute on a thread pool, which parallelizes loading; every LLM call
+    still goes through the pipeline's LLMScheduler, which bounds concurrency
+    and respects the per-model rate limits.
+    """
+
+    def __init__(self, pipeline, api_key, workers=8, defaults=None):
+        self.pipeline = pipeline
+        self.api_key = api_key
+        self.workers = workers
+        self.defaults = {
+            'model': DEFAULT_MODEL,
+            'summary_type': DEFAULT_SUMMARY_TYPE,
+            'word_count': 200,
+            'language': "English",
+            **(defaults or {})
+        }
+        self._write_lock = threading.Lock()
+
+    def run_row(self, row):
+        try:
+            result = self.pipeline.run(build_request(row, self.api_key, self.defaults))
+        except (SummarizerError, ValueError) as e:
+            return {'id': row['id'], 'status': "error", 'input': row, 'error': str(e)}
+        except Exception as e:
+            return {'id': row['id'], 'status': "error", 'input': row, 'error': f"{type(e).__name__}: {e}"}
+        return {'id': row['id'], 'status': "ok", 'input': row, **result.export_json}
+
+    def run(self, rows, output_path, on_result=None):
+        rows = list(rows)
+        done = completed_ids(output_path)
+        pending = [row for row in rows if row['id'] not in done]
+        counts = {'skipped': len(rows) - len(pending), 'ok': 0, 'error': 0}
+
+        with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.run_row, row) for row in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                with self._write_lock:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                counts[record['status']] += 1
+                if on_result is not None:
+                    on_result(record)
+        return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize every source listed in a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL file of sources")
+    parser.add_argument("output", help="JSONL file to append results to (resumable)")
+    parser.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY", ""), help="Groq API key (default: $GROQ_API_KEY)")
+    parser.add_argument("--workers", type=int, default=8, help="Rows processed in parallel")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="LLM calls in flight at once")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model id, or 'auto' for the fastest model that fits the content")
+    parser.add_argument("--summary-type", default=DEFAULT_SUMMARY_TYPE)
+    parser.add_argument("--length", default="200")
+    parser.add_argument("--language", default="English")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the summary and loader caches")
+    args = parser.parse_args(argv)
+
+    from summarizer.cache import SummaryCache
+    from summarizer.dedup import DuplicateIndex
+    from summarizer.loader_cache import LoaderCache
+    from summarizer.pipeline import SummarizationPipeline
+    from summarizer.scheduler import LLMScheduler
+
+    pipeline = SummarizationPipeline(
+        summary_cache=None if args.no_cache else SummaryCache.default(),
+        loader_cache=None if args.no_cache else LoaderCache.default(),
+        duplicate_index=None if args.no_cache else DuplicateIndex.default(),
+        scheduler=LLMScheduler(max_concurrency=args.max_concurrency)
+    )
+    runner = BatchRunner(pipeline, args.api_key, workers=args.workers, defaults={
+        'model': args.model,
+        'summary_type': parse_summary_type(args.summary_type),
+        'word_count': parse_length(args.length),
+        'language': args.language,
+    })
+
+    def log(record):
+        status = "✅" if record['status'] == "ok" else f"❌ {record['error']}"
+        print(f"{record['id']} {status}", file=sys.stderr)
+
+    counts = runner.run(read_jobs(args.input), args.output, on_result=log)
+    print(json.dumps(counts))
+    return 0 if counts['error'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from summarizer.config import CACHE_DIR
+
+_whitespace = re.compile(r"\s+")
+
+# How long a stored summary lives; the DuplicateIndex keeps signatures as long
+SUMMARY_TTL = 7 * 24 * 3600
+
+
+def normalize_content(text):
+    # Whitespace and Unicode form differences should not defeat the cache
+    return _whitespace.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text):
+    # Also accepts an iterable of chunks (cut on whitespace); hashes the same
+    # as normalize_content(" ".join(chunks)) without building the joined text
+    if isinstance(text, str):
+        return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+    digest = hashlib.sha256()
+    separator = b""
+    for chunk in text:
+        chunk = normalize_content(chunk)
+        if chunk:
+            digest.update(separator + chunk.encode("utf-8"))
+            separator = b" "
+    return digest.hexdigest()
+
+
+def summary_cache_key(text, model, summary_type, word_count, language, prompt_template=None, digest=None, variant=None):
+    # ``digest`` is a precomputed content_hash(text), e.g. of a near-duplicate source;
+    # ``variant`` names input transformations (e.g. extractive compression) that change the summary
+    parts = {
+        'content': digest or content_hash(text),
+        'model': model,
+        'summary_type': summary_type,
+        'word_count': int(word_count),
+        'language': language,
+        'prompt_template': prompt_template,
+    }
+    if variant:
+        # Added only when set so keys for plain summaries stay unchanged
+        parts['variant'] = variant
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def chunk_summary_key(text, model, prompt):
+    # Map-phase summaries depend only on the chunk, the model and the map prompt
+    parts = {
+        'chunk': content_hash(text),
+        'model': model,
+        'prompt': hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU with an entry limit and optional per-entry expiry."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires=None):
+        # ``expires``: absolute time.time() after which the entry is gone
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """Size-bounded on-disk byte store with per-entry TTL.
+
+    Entries live in a single SQLite file. When the total payload exceeds
+    ``max_bytes`` the least recently read entries are evicted first. An entry
+    may carry a ``tag`` (e.g. the content hash a summary was made from) so
+    callers can ask whether anything stored under a tag is still alive.
+
+    The payload total is kept in a meta row by triggers, so a write checks
+    the size bound without summing the table, and stays right when several
+    processes share the file. ``on_evict`` is called with the keys evicted
+    for space.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, default_ttl=SUMMARY_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.on_evict = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires REAL,"
+            " accessed REAL NOT NULL,"
+            " tag TEXT)"
+        )
+        if "tag" not in {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN tag TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_tag ON entries (tag)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires)")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries_meta (id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries"
+                    " BEGIN UPDATE entries_meta SET total = total + new.size; END"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries"
+                    " BEGIN UPDATE entries_meta SET total = total - old.size; END"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries"
+                    " BEGIN UPDATE entries_meta SET total = total + new.size - old.size; END"
+                )
+                # Summed once, when the meta row is first created
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO entries_meta (id, total) SELECT 1, COALESCE(SUM(size), 0) FROM entries"
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_entry(self, key):
+        """Return (value, expires) for a live entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires is not None and expires <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return value, expires
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value, ttl=None, tag=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._lock:
+            # An upsert, not INSERT OR REPLACE, so the size triggers see an update instead of a silent delete
+            self._conn.execute(
+                "INSERT INTO entries (key, value, size, expires, accessed, tag) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+                " expires = excluded.expires, accessed = excluded.accessed, tag = excluded.tag",
+                (key, value, len(value), expires, now, tag)
+            )
+            evicted = self._evict(now)
+        if evicted and self.on_evict is not None:
+            self.on_evict(evicted)
+
+    def live_tags(self, tags):
+        """Return the subset of ``tags`` with at least one unexpired entry."""
+        tags = list(tags)
+        if not tags:
+            return set()
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT tag FROM entries WHERE tag IN ({', '.join('?' * len(tags))})"
+                " AND (expires IS NULL OR expires > ?)",
+                (*tags, now)
+            ).fetchall()
+        return {tag for tag, in rows}
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def total_bytes(self):
+        with self._lock:
+            return self._total()
+
+    def _total(self):
+        return self._conn.execute("SELECT total FROM entries_meta").fetchone()[0]
+
+    def _evict(self, now):
+        # Returns the keys evicted for space; expired entries are simply gone
+        self._conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self._total()
+        evicted = []
+        while total > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted.append(key)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        return evicted
+
+
+class SummaryCache:
+    """Two-tier summary cache: an in-memory LRU in front of a DiskCache."""
+
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        if disk is not None:
+            # Memory entries expire with their disk copy and go when it is evicted, so the TTL bounds staleness
+            disk.on_evict = self.memory.delete_many
+
+    @classmethod
+    def default(cls):
+        return cls(disk=DiskCache(os.path.join(CACHE_DIR, "summaries.sqlite3")))
+
+    def get(self, key):
+        summary = self.memory.get(key)
+        if summary is not None:
+            return summary
+        if self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                raw, expires = entry
+                summary = json.loads(raw)['summary']
+                self.memory.set(key, summary, expires)
+                return summary
+        return None
+
+    def set(self, key, summary, digest=None):
+        # ``digest``: content hash of the source, so the DuplicateIndex can tell live sources from dead ones
+        if self.disk is None:
+            self.memory.set(key, summary)
+            return
+        # Memory first, so an entry evicted by its own write is dropped from both tiers
+        ttl = self.disk.default_ttl
+        self.memory.set(key, summary, time.time() + ttl if ttl else None)
+        self.disk.set(key, json.dumps({'summary': summary}).encode("utf-8"), tag=digest)
+
+    def stored_digests(self, digests):
+        """Return the subset of ``digests`` that still have a summary on disk."""
+        if self.disk is None:
+            # Nothing to check against; treat every source as alive
+            return set(digests)
+        return self.disk.live_tags(digests)
@@ -0,0 +1,208 @@
+import math
+from dataclasses import dataclass
+
+from summarizer.cache import chunk_summary_key
+from summarizer.config import DEFAULT_CONTEXT_WINDOW, model_info
+from summarizer.timing import maybe_span
+
+# Chunk-level prompt from the notebook's map_reduce example
+map_prompt_template = """
+Please summarize the below content:
+Content:`{text}'
+Summary:
+"""
+
+# LangChain's default refine question, kept so results stay comparable with the notebook
+refine_prompt_template = """
+Your job is to produce a final summary.
+We have provided an existing summary up to a certain point: {existing_answer}
+We have the opportunity to refine the existing summary (only if needed) with some more context below.
+------------
+{text}
+------------
+Given the new context, refine the original summary.
+If the context isn't useful, return the original summary.
+"""
+
+CHUNK_OVERLAP = 100
+MIN_CHUNK_SIZE = 2000
+CHARS_PER_TOKEN = 4
+MAP_OUTPUT_TOKENS = 512
+
+_encoding = None
+
+
+def count_tokens(text):
+    # tiktoken is optional; without it fall back to the usual ~4 chars/token
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def context_window(model):
+    return model_info.get(model, {}).get("context_window", DEFAULT_CONTEXT_WINDOW)
+
+
+def output_token_budget(word_count):
+    # Roughly 1.35 tokens per English word plus headroom for markdown structure
+    return int(word_count * 1.35) + 128
+
+
+@dataclass
+class ChainPlan:
+    chain_type: str
+    token_count: int
+    context_window: int
+    input_budget: int
+    chunk_count: int = 1
+    llm_calls: int = 0
+    # Map/collapse summaries served from the chunk cache instead of an LLM call
+    cached_chunks: int = 0
+
+
+def count_document_tokens(docs):
+    return sum(count_tokens(doc.page_content) for doc in docs)
+
+
+def input_token_budget(model, word_count, template):
+    # Room left for the content once the prompt and the expected output are accounted for
+    return context_window(model) - output_token_budget(word_count) - count_tokens(template)
+
+
+def map_input_budget(model):
+    # Room for a chunk in a map call. Unlike input_token_budget it ignores the summary
+    # template and length, so chunk boundaries, and cached chunk summaries, survive option changes
+    return context_window(model) - MAP_OUTPUT_TOKENS - count_tokens(map_prompt_template)
+
+
+def plan_chain(docs, model, word_count, template, chain_type="auto", token_count=None):
+    if token_count is None:
+        token_count = count_document_tokens(docs)
+    window = context_window(model)
+    input_budget = input_token_budget(model, word_count, template)
+    if chain_type == "auto":
+        chain_type = "stuff" if token_count <= input_budget else "map_reduce"
+    return ChainPlan(chain_type, token_count, window, input_budget)
+
+
+def chunk_size_for(input_budget):
+    # Chunks use about half the usable window so each map call has room for its output
+    return max(MIN_CHUNK_SIZE, (input_budget // 2) * CHARS_PER_TOKEN)
+
+
+def text_splitter(input_budget):
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size_for(input_budget), chunk_overlap=CHUNK_OVERLAP)
+
+
+def split_documents(docs, input_budget, tracer=None):
+    # Each document is split on its own, so splitting pages one by one gives the same chunks
+    splitter = text_splitter(input_budget)
+    with maybe_span(tracer, "split", chunk_size=chunk_size_for(input_budget)) as span:
+        chunks = splitter.split_documents(docs)
+        if span is not None:
+            span.set(chunks=len(chunks))
+    return chunks
+
+
+def stuff_text(docs):
+    # Same joining as LangChain's StuffDocumentsChain with its default document prompt
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+def _final_call(llm, prompt, plan, scheduler, model, output_tokens, on_token, tracer):
+    plan.llm_calls += 1
+    tokens = count_tokens(prompt) + output_tokens
+    if on_token is None:
+        return scheduler.invoke(llm, model, prompt, tokens, tracer, parent="chain", phase="final")
+    parts = []
+    for text in scheduler.stream(llm, model, prompt, tokens, tracer, parent="chain", phase="final", streamed=True):
+        parts.append(text)
+        on_token(text)
+    return "".join(parts)
+
+
+def run_stuff(llm, docs, template, plan, scheduler, model, output_tokens, on_token=None, tracer=None):
+    prompt = template.format(text=stuff_text(docs))
+    return _final_call(llm, prompt, plan, scheduler, model, output_tokens, on_token, tracer)
+
+
+def _map(llm, texts, plan, scheduler, model, tracer, phase, cache=None):
+    # The map prompt does not depend on the requested summary, so with a cache each
+    # chunk is summarized once per model and reused by every type, length and language
+    keys = [chunk_summary_key(text, model, map_prompt_template) for text in texts] if cache is not None else None
+    summaries = [cache.get(key) for key in keys] if cache is not None else [None] * len(texts)
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    plan.cached_chunks += len(texts) - len(missing)
+    if not missing:
+        return summaries
+
+    prompts = [map_prompt_template.format(text=texts[i]) for i in missing]
+    plan.llm_calls += len(prompts)
+    # Every chunk is in flight at once; the scheduler keeps us under the rate limits
+    tokens = [count_tokens(prompt) + MAP_OUTPUT_TOKENS for prompt in prompts]
+    for i, summary in zip(missing, scheduler.invoke_many(llm, model, prompts, tokens, tracer, parent="chain", phase=phase)):
+        summaries[i] = summary
+        if cache is not None:
+            cache.set(keys[i], summary)
+    return summaries
+
+
+def _group_to_budget(texts, budget):
+    groups, current, current_tokens = [], [], 0
+    for text in texts:
+        tokens = count_tokens(text)
+        if current and current_tokens + tokens > budget:
+            groups.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def run_map_reduce(llm, docs, template, plan, scheduler, model, output_tokens, on_token=None, tracer=None, chunks=None,
+                   cache=None):
+    # ``chunks``: docs already split for map_input_budget(model) (e.g. page by page while a file was parsed);
+    # ``cache``: SummaryCache for chunk summaries, so only the combine call depends on the template
+    if chunks is None:
+        chunks = split_documents(docs, map_input_budget(model), tracer)
+    plan.chunk_count = len(chunks)
+
+    summaries = _map(llm, [chunk.page_content for chunk in chunks], plan, scheduler, model, tracer, "map", cache)
+
+    # Collapse in parallel rounds until the chunk summaries fit one combine call. Groups are
+    # sized from the model alone so they (and their cached summaries) stay stable too.
+    while len(summaries) > 1 and sum(count_tokens(s) for s in summaries) > plan.input_budget:
+        groups = _group_to_budget(summaries, map_input_budget(model) // 2)
+        if len(groups) == len(summaries):
+            break
+        summaries = _map(llm, groups, plan, scheduler, model, tracer, "collapse", cache)
+
+    # Only the combine call is user-visible, so only it streams
+    prompt = template.format(text="\n\n".join(summaries))
+    return _final_call(llm, prompt, plan, scheduler, model, output_tokens, on_token, tracer)
+
+
+def run_refine(llm, docs, template, plan, scheduler, model, output_tokens, on_token=None, tracer=None, chunks=None):
+    # Inherently sequential: each step needs the previous summary
+    if chunks is None:
+        chunks = split_documents(docs, map_input_budget(model), tracer)
+    plan.chunk_count = len(chunks)
+
+    prompt = template.format(text=chunks[0].page_content)
+    for chunk in chunks[1:]:
+        plan.llm_calls += 1
+        summary = scheduler.invoke(llm, model, prompt, count_tokens(prompt) + output_tokens, tracer,
+                                   parent="chain", phase="refine")
+        prompt = refine_prompt_template.format(existing_answer=summary, text=chunk.page_content)
+    return _final_call(llm, prompt, plan, scheduler, model, output_tokens, on_token, tracer)
@@ -0,0 +1,146 @@
+"""Command-line summarization.
+
+Usage:
+    python -m summarizer https://www.youtube.com/watch?v=aircAruvnKk
+    python -m summarizer --wikipedia "Artificial Intelligence" --summary-type "Key Points Only"
+    python -m summarizer annual-report.pdf --length Long
+    cat notes.txt | python -m summarizer - --format text
+
+Prints the same export JSON the Streamlit app offers for download, including
+per-stage timings under ``metadata.timings`` and the full span list under
+``metadata.spans``; ``--trace FILE`` also appends every span to FILE as JSONL.
+"""
+import argparse
+import json
+import os
+import sys
+
+from summarizer.config import DEFAULT_MODEL, DEFAULT_SUMMARY_TYPE, parse_length, parse_summary_type
+
+EXIT_INVALID_KEY = 3
+EXIT_LOAD_FAILED = 4
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m summarizer", description="Summarize a URL, Wikipedia article, file or stdin text.")
+    parser.add_argument("source", nargs="?", help="URL, path to a PDF/TXT/MD or other text file, or '-' for stdin")
+    parser.add_argument("--wikipedia", metavar="QUERY", help="Summarize the Wikipedia article for QUERY")
+    parser.add_argument("--text", help="Summarize this text directly")
+    parser.add_argument("--api-key", default=os.environ.get("GROQ_API_KEY", ""), help="Groq API key (default: $GROQ_API_KEY)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Model id, 'auto' for the fastest model that fits the content, or 'textrank' to summarize offline without an API key")
+    parser.add_argument("--summary-type", default=DEFAULT_SUMMARY_TYPE, help="Full label or name, e.g. 'Executive Summary'")
+    parser.add_argument("--length", default="200", help="Word count or Short/Medium/Long/Extended")
+    parser.add_argument("--language", default="English")
+    parser.add_argument("--no-sentiment", action="store_true")
+    parser.add_argument("--no-keywords", action="store_true")
+    parser.add_argument("--no-readability", action="store_true")
+    parser.add_argument("--no-wordcloud", action="store_true")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the summary and loader caches")
+    parser.add_argument("--extractive", action="store_true", help="Compress long inputs to their most central sentences before the LLM call")
+    parser.add_argument("--stream", action="store_true", help="Print the summary as it is generated (to stderr with --format json)")
+    parser.add_argument("--format", choices=["json", "text"], default="json")
+    parser.add_argument("--trace", metavar="FILE", help="Append every timing span to FILE as JSON lines")
+    return parser
+
+
+def read_source(args, parser):
+    from summarizer.sources import ContentSource, resolve_source
+
+    if args.wikipedia:
+        return ContentSource("wikipedia", args.wikipedia)
+    if args.text:
+        return ContentSource("text", args.text)
+    if args.source == "-":
+        return ContentSource("text", sys.stdin.read())
+    if args.source and os.path.isfile(args.source):
+        from summarizer.files import is_supported_file
+
+        # PDF/TXT/MD files are read page by page; anything else is taken as plain text
+        if is_supported_file(args.source):
+            return ContentSource("file", args.source)
+        with open(args.source, encoding="utf-8", errors="replace") as f:
+            return ContentSource("text", f.read())
+    if args.source:
+        source = resolve_source(url=args.source)
+        if source is not None:
+            return source
+        parser.error(f"not a valid URL or file: {args.source}")
+    parser.error("provide a URL, file, '-', --wikipedia or --text")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    source = read_source(args, parser)
+
+    try:
+        summary_type = parse_summary_type(args.summary_type)
+        word_count = parse_length(args.length)
+    except ValueError as e:
+        parser.error(str(e))
+
+    from summarizer.exceptions import InvalidAPIKeyError, SourceLoadError
+    from summarizer.pipeline import SummarizationPipeline, SummaryRequest
+
+    if args.no_cache:
+        pipeline = SummarizationPipeline()
+    else:
+        from summarizer.cache import SummaryCache
+        from summarizer.dedup import DuplicateIndex
+        from summarizer.loader_cache import LoaderCache
+        pipeline = SummarizationPipeline(
+            summary_cache=SummaryCache.default(),
+            loader_cache=LoaderCache.default(),
+            duplicate_index=DuplicateIndex.default()
+        )
+
+    if args.trace:
+        from summarizer.timing import JsonLinesSpanExporter, add_span_listener
+        add_span_listener(JsonLinesSpanExporter(args.trace))
+
+    stream_to = sys.stdout if args.format == "text" else sys.stderr
+
+    def print_token(text):
+        stream_to.write(text)
+        stream_to.flush()
+
+    try:
+        result = pipeline.run(
+            SummaryRequest(
+                source=source,
+                api_key=args.api_key,
+                model=args.model,
+                summary_type=summary_type,
+                word_count=word_count,
+                language=args.language,
+                enable_sentiment=not args.no_sentiment,
+                enable_keywords=not args.no_keywords,
+                enable_readability=not args.no_readability,
+                enable_wordcloud=not args.no_wordcloud,
+                extractive=args.extractive
+            ),
+            on_token=print_token if args.stream else None
+        )
+    except InvalidAPIKeyError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_INVALID_KEY
+    except SourceLoadError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_LOAD_FAILED
+
+    streamed = args.stream and result.time_to_first_token is not None
+    if args.format == "text":
+        if not streamed:
+            print(result.summary)
+        else:
+            print()
+    else:
+        if streamed:
+            print(file=sys.stderr)
+        json.dump(result.export_json, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from summarizer.groq_api import key_hash
+
+# Clients unused for this long are dropped and their connection pools closed
+CLIENT_IDLE_TTL = 10 * 60
+MAX_CLIENTS = 32
+
+
+def create_chat_groq(model, api_key):
+    from langchain_groq import ChatGroq
+    # Retries are owned by the LLMScheduler so 429s are not retried twice
+    return ChatGroq(model=model, groq_api_key=api_key, max_retries=0)
+
+
+def close_chat_groq(llm):
+    """Close a ChatGroq's sync HTTP client; returns the coroutine closing its async one, if any.
+
+    ChatGroq keeps the Groq SDK clients behind its completions resources. The
+    async client must be closed on the event loop its connections belong to.
+    """
+    sync_client = getattr(getattr(llm, "client", None), "_client", None)
+    if sync_client is not None and hasattr(sync_client, "close"):
+        sync_client.close()
+    async_client = getattr(getattr(llm, "async_client", None), "_client", None)
+    if async_client is not None and hasattr(async_client, "close"):
+        return async_client.close()
+    return None
+
+
+class ClientPool:
+    """Reuses chat model clients per (model, API key hash).
+
+    Each ChatGroq holds keep-alive HTTP connection pools, so handing the same
+    instance to every request for a model and key keeps those connections
+    warm and repeat requests skip the TLS handshake. Keys are stored hashed.
+
+    Calls made with a client hold a ``lease`` on it; a client is idle once it
+    has no calls in flight, timed from when the last one finished. Clients
+    idle for longer than ``idle_ttl`` are evicted on the next access and
+    handed to ``closer``. When ``max_size`` is exceeded the least recently
+    used client stops being handed out and is closed once it is idle too.
+
+    The async half of a client is bound to the event loop it first ran on, so
+    a pool must only serve one loop; each LLMScheduler owns its own.
+    """
+
+    def __init__(self, factory=create_chat_groq, idle_ttl=CLIENT_IDLE_TTL, max_size=MAX_CLIENTS, closer=None):
+        self.factory = factory
+        self.idle_ttl = idle_ttl
+        self.max_size = max_size
+        self.closer = closer
+        # key -> [client, last used, calls in flight]; the same lists are found by id(client) for leases
+        self._clients = {}
+        self._retired = []
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, model, api_key):
+        key = (model, key_hash(api_key))
+        now = time.monotonic()
+        with self._lock:
+            expired = self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = self._clients[key] = [self.factory(model, api_key), now, 0]
+                self._entries[id(entry[0])] = entry
+                if len(self._clients) > self.max_size:
+                    oldest = min(self._clients, key=lambda k: self._clients[k][1])
+                    self._retired.append(self._clients.pop(oldest))
+            entry[1] = now
+            client = entry[0]
+        self._close(expired)
+        return client
+
+    @contextmanager
+    def lease(self, client):
+        """Mark ``client`` in use for the block; clients from elsewhere pass through untracked."""
+        with self._lock:
+            entry = self._entries.get(id(client))
+            if entry is not None and entry[0] is client:
+                entry[2] += 1
+            else:
+                entry = None
+        try:
+            yield client
+        finally:
+            if entry is not None:
+                with self._lock:
+                    entry[2] -= 1
+                    entry[1] = time.monotonic()
+
+    def _idle(self, entry, now):
+        return entry[2] == 0 and now - entry[1] > self.idle_ttl
+
+    def _evict_idle(self, now):
+        expired = [entry for entry in self._retired if self._idle(entry, now)]
+        self._retired = [entry for entry in self._retired if not self._idle(entry, now)]
+        for key in [k for k, entry in self._clients.items() if self._idle(entry, now)]:
+            expired.append(self._clients.pop(key))
+        for entry in expired:
+            del self._entries[id(entry[0])]
+        return [entry[0] for entry in expired]
+
+    def _close(self, clients):
+        # Outside the lock: closing does network I/O
+        if self.closer is None:
+            return
+        for client in clients:
+            try:
+                self.closer(client)
+            except Exception:
+                pass
+
+    def clear(self):
+        # Closes every idle client now; ones with calls in flight are retired and closed once idle like any other
+        with self._lock:
+            entries = list(self._clients.values()) + self._retired
+            self._clients.clear()
+            self._retired = [entry for entry in entries if entry[2]]
+            idle = [entry for entry in entries if not entry[2]]
+            for entry in idle:
+                del self._entries[id(entry[0])]
+        self._close([entry[0] for entry in idle])
+
+    def __len__(self):
+        return len(self._clients)
@@ -0,0 +1,109 @@
+import re
+import threading
+
+from summarizer.chains import count_tokens
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBED_BATCH_SIZE = 64
+
+# Only inputs this long are compressed; shorter ones go to the LLM as-is
+COMPRESS_MIN_TOKENS = 6000
+# Target size is 1/8 of the input, but never less than this many tokens
+COMPRESSION_RATIO = 8
+MIN_COMPRESSED_TOKENS = 1500
+# MMR trade-off: 1.0 picks purely by centrality, lower values favour diversity
+CENTRALITY_WEIGHT = 0.7
+# Unpunctuated transcripts are cut into windows of this many words instead of sentences
+WINDOW_WORDS = 40
+
+_sentence_end = re.compile(r'(?<=[.!?])\s+')
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def compression_budget(token_count):
+    if token_count < COMPRESS_MIN_TOKENS:
+        return None
+    return max(MIN_COMPRESSED_TOKENS, token_count // COMPRESSION_RATIO)
+
+
+def regex_sentences(text):
+    return _sentence_end.split(text)
+
+
+def split_sentences(docs, tokenize=regex_sentences):
+    # ``tokenize`` splits one document's text into sentences (e.g. nltk's punkt)
+    for doc in docs:
+        for sentence in tokenize(doc.page_content):
+            words = sentence.split()
+            if len(words) <= WINDOW_WORDS * 2:
+                if words:
+                    yield " ".join(words)
+                continue
+            # Auto-generated captions have no punctuation, so one "sentence" can be the whole video
+            for start in range(0, len(words), WINDOW_WORDS):
+                yield " ".join(words[start:start + WINDOW_WORDS])
+
+
+def default_embedder(sentences):
+    # CPU-only and loaded once per process; the first call downloads the model
+    global _model
+    with _model_lock:
+        if _model is None:
+            from sentence_transformers import SentenceTransformer
+            _model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    return _model.encode(sentences, batch_size=EMBED_BATCH_SIZE, normalize_embeddings=True,
+                         convert_to_numpy=True, show_progress_bar=False)
+
+
+def select_sentences(embeddings, token_counts, budget, centrality_weight=CENTRALITY_WEIGHT):
+    """Greedy maximal-marginal-relevance pick of sentence indices within ``budget`` tokens.
+
+    Centrality is cosine similarity to the document centroid; each pick is
+    penalized by its similarity to the closest sentence already chosen, so the
+    subset covers the content instead of repeating its most typical line.
+    Embeddings must be L2-normalized. Returns indices in document order.
+    """
+    import numpy as np
+
+    centroid = embeddings.mean(axis=0)
+    centroid /= np.linalg.norm(centroid) or 1.0
+    centrality = embeddings @ centroid
+    token_counts = np.asarray(token_counts)
+
+    closest = np.zeros(len(embeddings))
+    available = token_counts <= budget
+    selected = []
+    remaining = budget
+    while available.any():
+        scores = centrality_weight * centrality - (1 - centrality_weight) * closest
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining -= token_counts[best]
+        closest = np.maximum(closest, embeddings @ embeddings[best])
+        available[best] = False
+        # Drop everything that no longer fits, so no iteration is spent on skips
+        available &= token_counts <= remaining
+    return sorted(selected)
+
+
+def compress_documents(docs, budget, embedder=None):
+    """Return ([Document], info) holding the most central, diverse sentences up to ``budget`` tokens."""
+    from langchain.schema import Document
+
+    sentences = list(split_sentences(docs))
+    token_counts = [count_tokens(sentence) for sentence in sentences]
+    embeddings = (embedder or default_embedder)(sentences)
+    selected = select_sentences(embeddings, token_counts, budget)
+
+    text = " ".join(sentences[i] for i in selected)
+    info = {
+        'original_tokens': sum(token_counts),
+        'compressed_tokens': sum(token_counts[i] for i in selected),
+        'sentences': len(sentences),
+        'selected_sentences': len(selected),
+        'budget': budget,
+    }
+    return [Document(page_content=text, metadata={'extractive': True})], info
@@ -0,0 +1,100 @@
+# Static configuration shared by the Streamlit UI, app.py and headless drivers
+import os
+
+DEFAULT_MODEL = "gemma2-9b-it"
+
+# Pseudo-model: the pipeline picks the fastest model whose context fits the content
+AUTO_MODEL = "auto"
+
+# Pseudo-model: offline extractive summary (TextRank), no API key or network needed
+TEXTRANK_MODEL = "textrank"
+LOCAL_MODELS = frozenset({TEXTRANK_MODEL})
+
+model_options = {
+    AUTO_MODEL: "🧭 Auto (Fastest That Fits)",
+    "gemma2-9b-it": "🔥 Gemma 2 9B (Recommended)",
+    "llama3-8b-8192": "🦙 Llama 3 8B (Fast)",
+    "mixtral-8x7b-32768": "🌟 Mixtral 8x7B (Advanced)",
+    "llama3-70b-8192": "🚀 Llama 3 70B (Premium)",
+    TEXTRANK_MODEL: "📑 TextRank (Offline, Instant)"
+}
+
+# Model performance info; speed_rank orders models for the Auto router (lower is faster)
+model_info = {
+    "gemma2-9b-it": {"speed": "⚡ Fast", "quality": "🎯 High", "tokens": "8K", "context_window": 8192, "speed_rank": 1},
+    "llama3-8b-8192": {"speed": "🚀 Very Fast", "quality": "✅ Good", "tokens": "8K", "context_window": 8192, "speed_rank": 0},
+    "mixtral-8x7b-32768": {"speed": "⚡ Fast", "quality": "🌟 Excellent", "tokens": "32K", "context_window": 32768, "speed_rank": 1},
+    "llama3-70b-8192": {"speed": "🐌 Slow", "quality": "🏆 Premium", "tokens": "8K", "context_window": 8192, "speed_rank": 2}
+}
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Groq free-tier limits per model as (requests/min, tokens/min)
+rate_limits = {
+    "gemma2-9b-it": (30, 15000),
+    "llama3-8b-8192": (30, 30000),
+    "mixtral-8x7b-32768": (30, 5000),
+    "llama3-70b-8192": (30, 6000)
+}
+
+DEFAULT_RATE_LIMIT = (30, 6000)
+
+DEFAULT_SUMMARY_TYPE = "📋 Standard Summary"
+
+summary_types = [
+    "📋 Standard Summary",
+    "🎯 Executive Summary",
+    "📖 Detailed Analysis",
+    "🔍 Key Points Only",
+    "💡 Insights & Takeaways",
+    "📊 Structured Report"
+]
+
+summary_lengths = ["Short (100-200 words)", "Medium (200-400 words)", "Long (400-600 words)", "Extended (600-800 words)", "Custom"]
+
+language_options = {
+    "English": "en",
+    "Türkçe": "tr",
+    "Español": "es",
+    "Français": "fr",
+    "Deutsch": "de",
+    "Italiano": "it",
+    "Português": "pt",
+    "日本語": "ja",
+    "한국어": "ko",
+    "中文": "zh"
+}
+
+# Transcript languages tried, in order, for YouTube videos
+youtube_languages = ["en", "en-GB", "id", "de", "es", "fr", "it", "ja", "ko", "pt", "ru", "tr"]
+
+# Root directory for the on-disk caches
+CACHE_DIR = os.environ.get("SUMMARIZER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai-content-summarizer"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+def word_count_for_length(summary_length, custom_length=300):
+    if summary_length == "Custom":
+        return custom_length
+    return int(summary_length.split("(")[1].split("-")[0])
+
+
+def parse_summary_type(value):
+    if not value:
+        return DEFAULT_SUMMARY_TYPE
+    for summary_type in summary_types:
+        if value == summary_type or summary_type.endswith(value):
+            return summary_type
+    raise ValueError(f"Unknown summary type: {value}")
+
+
+def parse_length(value, default=200):
+    if value in (None, ""):
+        return default
+    if isinstance(value, int) or str(value).isdigit():
+        return int(value)
+    for label in summary_lengths:
+        if label.lower().startswith(str(value).lower()) and label != "Custom":
+            return word_count_for_length(label)
+    raise ValueError(f"Unknown summary length: {value}")
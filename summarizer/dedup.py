@@ -0,0 +1,224 @@
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+import time
+from bisect import bisect_left
+
+from summarizer.cache import SUMMARY_TTL
+from summarizer.config import CACHE_DIR
+
+# One-permutation MinHash: 128 bins over the 64-bit shingle hash space,
+# banded 32 x 4 for LSH. At the default 0.85 threshold a true near-duplicate
+# shares at least one band with probability > 0.999.
+SIGNATURE_BINS = 128
+BAND_ROWS = 4
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 2 * SIGNATURE_BINS
+DEFAULT_THRESHOLD = 0.85
+# Each signature costs about 1 KB packed, plus a bucket entry per band, once the index is open
+MAX_SIGNATURES = 20_000
+
+_MASK = (1 << 64) - 1
+_BIN_SHIFT = 64 - (SIGNATURE_BINS.bit_length() - 1)
+_EMPTY = _MASK
+_EMPTY_ROW = b"\xff" * 8
+_BAND_BYTES = 8 * BAND_ROWS
+_P1 = 0x9E3779B97F4A7C15
+_P2 = 0xC2B2AE3D27D4EB4F
+
+
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """Streaming MinHash signature over word shingles.
+
+    Each chunk's shingle hashes are sorted once and the minimum per bin is
+    found by bisecting the bin boundaries, so the cost is one set build and
+    sort per chunk with memory bounded by the chunk, not the document.
+    """
+
+    def __init__(self):
+        self.mins = [_EMPTY] * SIGNATURE_BINS
+        self.shingles = 0
+        self._words = {}
+
+    def update(self, text):
+        words = text.lower().split()
+        if len(words) < SHINGLE_WORDS:
+            return
+        cache = self._words
+        hashes = [cache[w] if w in cache else cache.setdefault(w, _word_hash(w)) for w in words]
+        shingles = sorted({(a * _P1 + b * _P2 + c) & _MASK for a, b, c in zip(hashes, hashes[1:], hashes[2:])})
+        self.shingles += len(shingles)
+        mins = self.mins
+        for i in range(SIGNATURE_BINS):
+            pos = bisect_left(shingles, i << _BIN_SHIFT)
+            if pos < len(shingles) and shingles[pos] >> _BIN_SHIFT == i and shingles[pos] < mins[i]:
+                mins[i] = shingles[pos]
+        # Vocabulary cache only needs to live for one document
+        if len(cache) > 200_000:
+            cache.clear()
+
+    def signature(self):
+        # Too little text gives a signature that matches almost anything
+        if self.shingles < MIN_SHINGLES:
+            return None
+        return tuple(self.mins)
+
+
+def minhash_signature(chunks):
+    hasher = MinHasher()
+    for chunk in chunks:
+        hasher.update(chunk)
+    return hasher.signature()
+
+
+def similarity(a, b):
+    # Fraction of bins that agree, over bins filled in at least one signature
+    filled = same = 0
+    for x, y in zip(a, b):
+        if x == _EMPTY and y == _EMPTY:
+            continue
+        filled += 1
+        same += x == y
+    return same / filled if filled else 0.0
+
+
+def _band_keys(packed):
+    # Buckets are keyed by a hash of each band's bytes; a collision only adds a candidate that similarity rejects
+    for start in range(0, len(packed), _BAND_BYTES):
+        rows = packed[start:start + _BAND_BYTES]
+        if all(rows[i:i + 8] != _EMPTY_ROW for i in range(0, _BAND_BYTES, 8)):
+            yield hash((start, rows))
+
+
+def _pack(signature):
+    return struct.pack(f"<{SIGNATURE_BINS}Q", *signature)
+
+
+def _unpack(raw):
+    return struct.unpack(f"<{SIGNATURE_BINS}Q", raw)
+
+
+class DuplicateIndex:
+    """Persistent LSH index from MinHash signatures to content hashes.
+
+    Signatures are stored in SQLite and kept packed in memory, with the
+    band buckets rebuilt from band hashes on open, so a lookup is a handful
+    of dict probes plus a similarity check per candidate. Like the summaries the digests point
+    to, an entry expires ``ttl`` seconds after it was last added, and past
+    ``max_entries`` the least recently added go first; ``remove`` drops
+    digests whose summaries are already gone.
+    """
+
+    def __init__(self, path, threshold=DEFAULT_THRESHOLD, ttl=SUMMARY_TTL, max_entries=MAX_SIGNATURES):
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._signatures = {}
+        self._used = {}
+        self._buckets = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " digest TEXT PRIMARY KEY,"
+            " signature BLOB NOT NULL,"
+            " created REAL NOT NULL,"
+            " used REAL)"
+        )
+        if "used" not in {row[1] for row in self._conn.execute("PRAGMA table_info(signatures)")}:
+            self._conn.execute("ALTER TABLE signatures ADD COLUMN used REAL")
+        self._conn.execute("UPDATE signatures SET used = created WHERE used IS NULL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS signatures_used ON signatures (used)")
+        with self._lock:
+            self._expire(time.time())
+        for digest, raw, used in self._conn.execute("SELECT digest, signature, used FROM signatures"):
+            self._index(digest, raw, used)
+
+    @classmethod
+    def default(cls):
+        return cls(os.path.join(CACHE_DIR, "duplicates.sqlite3"))
+
+    def _index(self, digest, packed, used):
+        self._signatures[digest] = packed
+        self._used[digest] = used
+        for key in _band_keys(packed):
+            self._buckets.setdefault(key, set()).add(digest)
+
+    def _unindex(self, digest):
+        packed = self._signatures.pop(digest, None)
+        self._used.pop(digest, None)
+        if packed is None:
+            return
+        for key in _band_keys(packed):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(digest)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _delete(self, digests):
+        for digest in digests:
+            self._conn.execute("DELETE FROM signatures WHERE digest = ?", (digest,))
+            self._unindex(digest)
+
+    def _expire(self, now):
+        expired = [digest for digest, in self._conn.execute(
+            "SELECT digest FROM signatures WHERE used <= ?", (now - self.ttl,)
+        )]
+        overflow = self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0] - len(expired) - self.max_entries
+        if overflow > 0:
+            expired += [digest for digest, in self._conn.execute(
+                "SELECT digest FROM signatures WHERE used > ? ORDER BY used LIMIT ?", (now - self.ttl, overflow)
+            )]
+        self._delete(expired)
+
+    def add(self, digest, signature):
+        # Called whenever the digest's summary is stored or served, which keeps it alive as long as the summary
+        if signature is None:
+            return
+        now = time.time()
+        with self._lock:
+            if digest in self._signatures:
+                self._conn.execute("UPDATE signatures SET used = ? WHERE digest = ?", (now, digest))
+                self._used[digest] = now
+                return
+            packed = _pack(signature)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (digest, signature, created, used) VALUES (?, ?, ?, ?)",
+                (digest, packed, now, now)
+            )
+            self._index(digest, packed, now)
+            if len(self._signatures) > self.max_entries:
+                self._expire(now)
+
+    def remove(self, digests):
+        with self._lock:
+            self._delete(digests)
+
+    def find(self, signature, exclude=None):
+        """Return [(digest, similarity)] at or above the threshold, most similar first."""
+        if signature is None:
+            return []
+        now = time.time()
+        with self._lock:
+            candidates = set()
+            for key in _band_keys(_pack(signature)):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude)
+            expired = {digest for digest in candidates if self._used[digest] <= now - self.ttl}
+            self._delete(expired)
+            scored = [(digest, similarity(signature, _unpack(self._signatures[digest])))
+                      for digest in candidates - expired]
+        return sorted([m for m in scored if m[1] >= self.threshold], key=lambda m: m[1], reverse=True)
+
+    def __len__(self):
+        return len(self._signatures)
@@ -0,0 +1,10 @@
+class SummarizerError(Exception):
+    """Base class for errors raised by the summarization pipeline."""
+
+
+class InvalidAPIKeyError(SummarizerError):
+    pass
+
+
+class SourceLoadError(SummarizerError):
+    pass
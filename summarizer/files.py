@@ -0,0 +1,139 @@
+import mmap
+import os
+import shutil
+import tempfile
+import time
+
+from summarizer.config import CACHE_DIR
+from summarizer.exceptions import SourceLoadError
+
+PDF_EXTENSIONS = (".pdf",)
+TEXT_EXTENSIONS = (".txt", ".md", ".markdown")
+SUPPORTED_EXTENSIONS = PDF_EXTENSIONS + TEXT_EXTENSIONS
+
+# Plain text is cut into "pages" of about this many characters, on line breaks
+TEXT_PAGE_CHARS = 64 * 1024
+COPY_BLOCK_BYTES = 1024 * 1024
+UPLOAD_DIR = os.path.join(CACHE_DIR, "uploads")
+# Uploads are deleted after each run; this only catches copies left by a crash
+UPLOAD_TTL = 60 * 60
+
+
+def is_supported_file(path):
+    return path.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def save_upload(fileobj, name, directory=None):
+    """Copy an uploaded file to disk block by block and return its path.
+
+    Each copy gets its own private directory and keeps the original file
+    name. Callers delete it with ``remove_upload`` as soon as the run is over;
+    copies a crashed run left behind are swept once older than ``UPLOAD_TTL``.
+    """
+    directory = directory or UPLOAD_DIR
+    os.makedirs(directory, exist_ok=True)
+    sweep_uploads(directory)
+    target = tempfile.mkdtemp(dir=directory)
+    path = os.path.join(target, os.path.basename(name) or "upload")
+    try:
+        fileobj.seek(0)
+        with open(path, "wb") as out:
+            for block in iter(lambda: fileobj.read(COPY_BLOCK_BYTES), b""):
+                out.write(block)
+    except BaseException:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+    return path
+
+
+def remove_upload(path, directory=None):
+    # Only ever removes a directory save_upload created
+    target = os.path.dirname(os.path.abspath(path))
+    if os.path.dirname(target) == os.path.abspath(directory or UPLOAD_DIR):
+        shutil.rmtree(target, ignore_errors=True)
+
+
+def sweep_uploads(directory=None, max_age=UPLOAD_TTL):
+    directory = directory or UPLOAD_DIR
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def _page(text, name, number, total=None):
+    from langchain.schema import Document
+
+    metadata = {'source': name, 'page': number}
+    if total is not None:
+        metadata['total_pages'] = total
+    return Document(page_content=text, metadata=metadata)
+
+
+def iter_pdf_pages(path):
+    # The file is memory-mapped and handed to MuPDF without a copy, so only the pages
+    # being read are paged in; text is extracted one page at a time
+    import pymupdf
+
+    name = os.path.basename(path)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            with pymupdf.open(stream=view, filetype="pdf") as pdf:
+                total = pdf.page_count
+                for number, page in enumerate(pdf, start=1):
+                    text = page.get_text()
+                    # Scanned pages have no text layer
+                    if text.strip():
+                        yield _page(text, name, number, total)
+        finally:
+            view.release()
+
+
+def iter_text_pages(path, page_chars=TEXT_PAGE_CHARS):
+    name = os.path.basename(path)
+    number = 0
+    carry = ""
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        while True:
+            block = f.read(page_chars)
+            text = carry + block
+            if not block:
+                if text.strip():
+                    yield _page(text, name, number + 1)
+                return
+            # Cut on the last line break (or space) so no word spans two pages
+            cut = text.rfind("\n")
+            if cut <= 0:
+                cut = text.rfind(" ")
+            if cut <= 0:
+                cut = len(text)
+            carry = text[cut:]
+            if text[:cut].strip():
+                number += 1
+                yield _page(text[:cut], name, number)
+
+
+def iter_file_pages(path):
+    """Yield a Document per page (PDF) or ~64K-character block (text) of a local file."""
+    if not is_supported_file(path):
+        raise SourceLoadError(f"Unsupported file type: {os.path.basename(path)} (use PDF, TXT or MD)")
+    is_pdf = path.lower().endswith(PDF_EXTENSIONS)
+    pages = iter_pdf_pages(path) if is_pdf else iter_text_pages(path)
+    found = False
+    try:
+        for page in pages:
+            found = True
+            yield page
+    except (ImportError, OSError, RuntimeError, ValueError) as e:
+        raise SourceLoadError(f"Failed to read {os.path.basename(path)}: {e}") from e
+    if not found:
+        hint = "; scanned PDFs need OCR first" if is_pdf else ""
+        raise SourceLoadError(f"No text found in {os.path.basename(path)}{hint}")
@@ -0,0 +1,71 @@
+import hashlib
+import threading
+import time
+
+from summarizer.sessions import shared_session
+
+GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
+
+# (connect, read) seconds; validation must never hang the Generate button
+REQUEST_TIMEOUT = (3.05, 10)
+VALID_KEY_TTL = 10 * 60
+INVALID_KEY_TTL = 60
+
+_validations = {}
+_validations_lock = threading.Lock()
+
+
+def http_session():
+    # One keep-alive session for the whole process so repeat checks skip the TLS handshake
+    return shared_session("groq", pool_connections=4, pool_maxsize=16)
+
+
+def key_hash(api_key):
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def fetch_models(api_key):
+    """Return the model ids the key can use, or None when the key is rejected."""
+    import requests
+
+    try:
+        response = http_session().get(
+            GROQ_MODELS_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=REQUEST_TIMEOUT
+        )
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    try:
+        return frozenset(model['id'] for model in response.json().get('data', []))
+    except (ValueError, KeyError, TypeError):
+        return frozenset()
+
+
+def validate_api_key(api_key):
+    # Memoized per key hash; failures expire quickly so a transient error can be retried
+    if not api_key or not isinstance(api_key, str) or "gsk_" not in api_key:
+        return None
+
+    digest = key_hash(api_key)
+    now = time.monotonic()
+    with _validations_lock:
+        cached = _validations.get(digest)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    models = fetch_models(api_key)
+    ttl = VALID_KEY_TTL if models is not None else INVALID_KEY_TTL
+    with _validations_lock:
+        _validations[digest] = (now + ttl, models)
+    return models
+
+
+def check_groq_api_key(api_key):
+    return validate_api_key(api_key) is not None
+
+
+def available_models(api_key):
+    return validate_api_key(api_key) or frozenset()
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from summarizer.config import CACHE_DIR
+
+
+def history_owner(api_key=None, session_id=None):
+    """Owner id for history rows: a hash of the API key, else the browser session id.
+
+    The key itself is never stored; the same key sees the same history across
+    sessions and restarts, and runs without a key stay private to the session.
+    """
+    if api_key:
+        return "key:" + hashlib.sha256(("history:" + api_key).encode("utf-8")).hexdigest()[:32]
+    return "session:" + session_id
+
+
+class HistoryStore:
+    """Persistent summary history in a local SQLite file.
+
+    Every row belongs to an ``owner`` (see ``history_owner``) and every read,
+    aggregate and ``clear`` is scoped to one owner, so visitors of a shared app
+    never see each other's summaries. The columns the dashboard filters and
+    aggregates on are stored (and indexed) next to the full history entry,
+    which is kept as JSON and only decoded for the rows actually displayed.
+    Totals, per-day and per-model counts are maintained incrementally per
+    owner on every ``add`` so dashboard reads stay O(1) in the history size,
+    and an owner's ``version`` changes on every write so callers can cache
+    anything derived from that owner's history.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " owner TEXT NOT NULL DEFAULT '',"
+            " timestamp TEXT NOT NULL,"
+            " model TEXT,"
+            " source_type TEXT,"
+            " processing_time REAL,"
+            " word_count INTEGER,"
+            " compression_ratio REAL,"
+            " cache_hit INTEGER,"
+            " entry TEXT NOT NULL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+        if "owner" not in columns:
+            # Rows from before owners existed were shared by everyone; they stay hidden from all owners
+            self._conn.execute("ALTER TABLE history ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+        for column in ("timestamp", "model", "source_type", "processing_time"):
+            self._conn.execute(f"DROP INDEX IF EXISTS history_{column}")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS history_owner_{column} ON history (owner, {column})")
+        tables = {row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history_owner_totals ("
+            " owner TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " total INTEGER NOT NULL,"
+            " processing_time REAL NOT NULL,"
+            " word_count INTEGER NOT NULL,"
+            " compression_ratio REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history_owner_daily ("
+            " owner TEXT NOT NULL, day TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (owner, day))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history_owner_models ("
+            " owner TEXT NOT NULL, model TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (owner, model))"
+        )
+        if "history_owner_totals" not in tables:
+            # Store created before per-owner aggregates existed: build them once
+            with self._lock:
+                self._rebuild_aggregates()
+            for table in ("history_totals", "history_daily", "history_models"):
+                self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def _rebuild_aggregates(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM history_owner_totals")
+            self._conn.execute("DELETE FROM history_owner_daily")
+            self._conn.execute("DELETE FROM history_owner_models")
+            self._conn.execute(
+                "INSERT INTO history_owner_totals (owner, version, total, processing_time, word_count, compression_ratio)"
+                " SELECT owner, 0, COUNT(*), COALESCE(SUM(processing_time), 0), COALESCE(SUM(word_count), 0),"
+                " COALESCE(SUM(compression_ratio), 0) FROM history GROUP BY owner"
+            )
+            self._conn.execute(
+                "INSERT INTO history_owner_daily (owner, day, count) SELECT owner, substr(timestamp, 1, 10), COUNT(*)"
+                " FROM history GROUP BY owner, substr(timestamp, 1, 10)"
+            )
+            self._conn.execute(
+                "INSERT INTO history_owner_models (owner, model, count) SELECT owner, COALESCE(model, 'Unknown'), COUNT(*)"
+                " FROM history GROUP BY owner, COALESCE(model, 'Unknown')"
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @classmethod
+    def default(cls):
+        return cls(os.path.join(CACHE_DIR, "history.sqlite3"))
+
+    def add(self, owner, entry):
+        processing_time = entry.get('processing_time', 0)
+        word_count = entry.get('word_count', 0)
+        compression_ratio = entry.get('compression_ratio', 0)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO history (owner, timestamp, model, source_type, processing_time, word_count,"
+                    " compression_ratio, cache_hit, entry) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        owner,
+                        entry['timestamp'],
+                        entry.get('model'),
+                        entry['content_info']['type'],
+                        processing_time,
+                        word_count,
+                        compression_ratio,
+                        int(bool(entry.get('cache_hit'))),
+                        json.dumps(entry, default=str)
+                    )
+                )
+                self._conn.execute(
+                    "INSERT INTO history_owner_totals (owner, version, total, processing_time, word_count, compression_ratio)"
+                    " VALUES (?, 1, 1, ?, ?, ?)"
+                    " ON CONFLICT (owner) DO UPDATE SET version = version + 1, total = total + 1,"
+                    " processing_time = processing_time + excluded.processing_time,"
+                    " word_count = word_count + excluded.word_count,"
+                    " compression_ratio = compression_ratio + excluded.compression_ratio",
+                    (owner, processing_time, word_count, compression_ratio)
+                )
+                self._conn.execute(
+                    "INSERT INTO history_owner_daily (owner, day, count) VALUES (?, ?, 1)"
+                    " ON CONFLICT (owner, day) DO UPDATE SET count = count + 1",
+                    (owner, entry['timestamp'][:10])
+                )
+                self._conn.execute(
+                    "INSERT INTO history_owner_models (owner, model, count) VALUES (?, ?, 1)"
+                    " ON CONFLICT (owner, model) DO UPDATE SET count = count + 1",
+                    (owner, entry.get('model') or 'Unknown')
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cursor.lastrowid
+
+    def _totals(self, owner):
+        row = self._conn.execute(
+            "SELECT version, total, processing_time, word_count, compression_ratio FROM history_owner_totals"
+            " WHERE owner = ?", (owner,)
+        ).fetchone()
+        return row or (0, 0, 0.0, 0, 0.0)
+
+    def version(self, owner):
+        with self._lock:
+            return self._totals(owner)[0]
+
+    def count(self, owner):
+        with self._lock:
+            return self._totals(owner)[1]
+
+    def page(self, owner, offset=0, limit=10):
+        # Newest first
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entry FROM history WHERE owner = ? ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (owner, limit, offset)
+            ).fetchall()
+        return [json.loads(entry) for entry, in rows]
+
+    def iter_entries(self, owner):
+        # Oldest first, in batches so exports never hold the whole table twice
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, entry FROM history WHERE owner = ? AND id > ? ORDER BY id LIMIT 500", (owner, last_id)
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, entry in rows:
+                yield json.loads(entry)
+
+    def stats(self, owner):
+        with self._lock:
+            version, total, processing_time, word_count, compression_ratio = self._totals(owner)
+        return {
+            'version': version,
+            'total_summaries': total,
+            'average_processing_time': processing_time / total if total else 0,
+            'total_words': word_count,
+            'average_compression': compression_ratio / total if total else 0
+        }
+
+    def usage_by_day(self, owner):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT day, count FROM history_owner_daily WHERE owner = ? ORDER BY day", (owner,)
+            ).fetchall()
+
+    def model_counts(self, owner):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT model, count FROM history_owner_models WHERE owner = ? ORDER BY count DESC", (owner,)
+            ).fetchall()
+
+    def processing_times(self, owner, limit=500):
+        # The most recent ``limit`` runs, returned in chronological order for plotting
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT timestamp, processing_time FROM history WHERE owner = ?"
+                " ORDER BY timestamp DESC, id DESC LIMIT ?", (owner, limit)
+            ).fetchall()
+        return rows[::-1]
+
+    def clear(self, owner):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM history WHERE owner = ?", (owner,))
+                self._conn.execute("DELETE FROM history_owner_daily WHERE owner = ?", (owner,))
+                self._conn.execute("DELETE FROM history_owner_models WHERE owner = ?", (owner,))
+                # Keep counting up so figures cached for the old history are never reused
+                self._conn.execute(
+                    "UPDATE history_owner_totals SET version = version + 1, total = 0, processing_time = 0,"
+                    " word_count = 0, compression_ratio = 0 WHERE owner = ?", (owner,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from summarizer.cache import DiskCache
+from summarizer.config import CACHE_DIR, youtube_languages
+
+# Transcripts never change once published; web pages and Wikipedia do
+default_ttls = {
+    'youtube': 30 * 24 * 3600,
+    'website': 6 * 3600,
+    'wikipedia': 24 * 3600,
+}
+
+# Pages that sent an ETag or Last-Modified are kept this long past their TTL, so a
+# stale entry can be revalidated with a conditional GET instead of a full download
+REVALIDATE_TTL = 7 * 24 * 3600
+VALIDATOR_KEYS = ('etag', 'last_modified')
+# Entries are stored as this marker, the last-checked time and the documents; zlib data never starts with it
+_STAMPED = b"\x00"
+_STAMP = struct.Struct("<d")
+
+_youtube_id = re.compile(r"(?:v=|/shorts/|/embed/|/live/|youtu\.be/)([A-Za-z0-9_-]{11})")
+_tracking_params = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def youtube_video_id(url):
+    match = _youtube_id.search(url)
+    return match.group(1) if match else None
+
+
+def canonical_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_tracking_params)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def source_identity(source):
+    """Return (source_type, identity) for cacheable sources, or None."""
+    if source.kind == "url":
+        if source.is_youtube:
+            video_id = youtube_video_id(source.value)
+            if video_id:
+                identity = f"{video_id}|{','.join(youtube_languages)}"
+                # Documents loaded with video info carry different metadata
+                return 'youtube', f"{identity}|info" if source.video_info else identity
+        return 'website', canonical_url(source.value)
+    elif source.kind == "wikipedia":
+        return 'wikipedia', " ".join(source.value.split()).casefold()
+    return None
+
+
+def serialize_documents(docs):
+    payload = [{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in docs]
+    return zlib.compress(json.dumps(payload, default=str).encode("utf-8"), 6)
+
+
+def deserialize_documents(raw):
+    from langchain.schema import Document
+
+    payload = json.loads(zlib.decompress(raw).decode("utf-8"))
+    return [Document(page_content=item['page_content'], metadata=item['metadata']) for item in payload]
+
+
+def has_validators(docs):
+    return bool(docs) and any(docs[0].metadata.get(k) for k in VALIDATOR_KEYS)
+
+
+class LoaderCache:
+    """Persistent cache of parsed Documents keyed by normalized source identity."""
+
+    def __init__(self, disk, ttls=None):
+        self.disk = disk
+        self.ttls = dict(default_ttls, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        return cls(DiskCache(os.path.join(CACHE_DIR, "documents.sqlite3"), max_bytes=512 * 1024 * 1024))
+
+    @staticmethod
+    def key_for(source):
+        identity = source_identity(source)
+        if identity is None:
+            return None, None
+        source_type, value = identity
+        return source_type, hashlib.sha256(f"{source_type}:{value}".encode("utf-8")).hexdigest()
+
+    def lookup(self, source):
+        """Return (docs, fresh) for a cached source, or None.
+
+        Entries past their TTL only survive when they carry HTTP validators;
+        those come back with ``fresh=False`` for the loader to revalidate.
+        """
+        source_type, key = self.key_for(source)
+        if key is None:
+            return None
+        raw = self.disk.get(key)
+        fresh = raw is not None
+        if fresh and raw[:1] == _STAMPED:
+            checked, = _STAMP.unpack_from(raw, 1)
+            ttl = self.ttls.get(source_type)
+            fresh = not ttl or time.time() - checked < ttl
+            raw = raw[1 + _STAMP.size:]
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return (deserialize_documents(raw), fresh) if raw is not None else None
+
+    def get(self, source):
+        entry = self.lookup(source)
+        return entry[0] if entry is not None and entry[1] else None
+
+    def set(self, source, docs, revalidated=False):
+        # ``revalidated``: the origin answered 304, so these are the cached docs with a renewed TTL
+        source_type, key = self.key_for(source)
+        if key is None or not docs:
+            return
+        ttl = self.ttls.get(source_type)
+        if ttl and has_validators(docs):
+            ttl = max(ttl, REVALIDATE_TTL)
+        self.disk.set(key, _STAMPED + _STAMP.pack(time.time()) + serialize_documents(docs), ttl=ttl)
+        if revalidated:
+            with self._lock:
+                self.revalidated += 1
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'revalidated': self.revalidated}
@@ -0,0 +1,508 @@
+import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+
+from summarizer.analysis import TextStats, analyze_content, iter_text_chunks
+from summarizer.cache import content_hash, summary_cache_key
+from summarizer.chains import (count_document_tokens, count_tokens, map_input_budget, output_token_budget, plan_chain,
+                               run_map_reduce, run_refine, run_stuff, text_splitter)
+from summarizer.compress import compress_documents, compression_budget
+from summarizer.config import AUTO_MODEL, DEFAULT_MODEL, DEFAULT_SUMMARY_TYPE, LOCAL_MODELS
+from summarizer.dedup import minhash_signature
+from summarizer.exceptions import InvalidAPIKeyError, SourceLoadError
+from summarizer.files import iter_file_pages
+from summarizer.groq_api import check_groq_api_key
+from summarizer.prompts import build_prompt_template
+from summarizer.router import route_model
+from summarizer.scheduler import default_scheduler
+from summarizer.sources import describe_source, load_documents
+from summarizer.textrank import textrank_summary
+from summarizer.timing import Tracer
+
+
+@dataclass
+class SummaryRequest:
+    source: object
+    api_key: str
+    model: str = DEFAULT_MODEL
+    summary_type: str = DEFAULT_SUMMARY_TYPE
+    word_count: int = 200
+    language: str = "English"
+    enable_sentiment: bool = True
+    enable_keywords: bool = True
+    enable_readability: bool = True
+    enable_wordcloud: bool = True
+    # Overrides the summary_type template; must contain a {text} placeholder
+    prompt_template: str = None
+    use_cache: bool = True
+    # "auto" picks stuff or map_reduce from the token count; "refine" is opt-in
+    chain_type: str = "auto"
+    # Models the Auto router may choose from when model is AUTO_MODEL (default: all known)
+    auto_models: list = None
+    # Send only the most central, diverse sentences of long inputs to the LLM
+    extractive: bool = False
+
+
+@dataclass
+class SummaryResult:
+    summary: str
+    content_info: dict
+    model: str
+    language: str
+    summary_type: str
+    original_words: int
+    analysis: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    # Nested span records (name, parent, start, duration, attributes) from the Tracer
+    spans: list = field(default_factory=list)
+    processing_time: float = 0.0
+    cache_hit: bool = False
+    loader_cache_hit: bool = False
+    # {'digest', 'similarity'} when the summary was reused from a near-duplicate source
+    near_duplicate: dict = None
+    chain: dict = None
+    # RoutingDecision as a dict when the model was picked by the Auto router
+    routing: dict = None
+    # Token and sentence counts when extractive pre-compression was applied
+    compression: dict = None
+    # Seconds from the start of the run to the first streamed token
+    time_to_first_token: float = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    export_json: dict = None
+    export_text: str = None
+    # Live tracer so drivers can add their own spans (e.g. rendering) before re-exporting
+    trace: Tracer = field(default=None, repr=False)
+
+    @property
+    def summary_words(self):
+        return len(self.summary.split())
+
+    @property
+    def compression_ratio(self):
+        return (self.original_words / self.summary_words) if self.summary else 0
+
+    def to_history_entry(self):
+        return {
+            'summary': self.summary,
+            'content_info': self.content_info,
+            'processing_time': self.processing_time,
+            'model': self.model,
+            'language': self.language,
+            'summary_type': self.summary_type,
+            'timestamp': self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            'analysis': self.analysis,
+            'word_count': self.summary_words,
+            'compression_ratio': self.compression_ratio,
+            'cache_hit': self.cache_hit,
+            'loader_cache_hit': self.loader_cache_hit,
+            'near_duplicate': self.near_duplicate,
+            'chain': self.chain,
+            'routing': self.routing,
+            'compression': self.compression,
+            'time_to_first_token': self.time_to_first_token,
+            'timings': self.timings,
+            'spans': self.spans
+        }
+
+
+def _fan_out(items, queues):
+    # Hands each item to every consumer queue as it is produced; None marks the end, even on errors
+    try:
+        for item in items:
+            for q in queues:
+                q.put(item)
+            yield item
+    finally:
+        for q in queues:
+            q.put(None)
+
+
+class SummarizationPipeline:
+    """Headless summarization engine: resolve -> load -> chain -> analyze -> export.
+
+    Every stage is a plain method so drivers can call them individually; ``run``
+    chains them together and records per-stage wall time on the result.
+    """
+
+    def __init__(self, llm_factory=None, key_validator=check_groq_api_key,
+                 summary_cache=None, loader_cache=None, scheduler=None, duplicate_index=None, embedder=None):
+        self.key_validator = key_validator
+        self.summary_cache = summary_cache
+        self.loader_cache = loader_cache
+        # Optional DuplicateIndex; lets the summary cache serve near-duplicate sources
+        self.duplicate_index = duplicate_index
+        # Sentence embedder for extractive pre-compression (default: sentence-transformers on CPU)
+        self.embedder = embedder
+        self.scheduler = scheduler if scheduler is not None else default_scheduler
+        # Clients come from the scheduler's pool, so repeat requests reuse warm connections on its loop
+        self.llm_factory = llm_factory if llm_factory is not None else self.scheduler.clients.get
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline")
+
+    def resolve(self, source):
+        return describe_source(source)
+
+    def validate(self, api_key):
+        if not api_key or not api_key.strip() or not self.key_validator(api_key):
+            raise InvalidAPIKeyError("Please provide a valid Groq API key.")
+
+    def load(self, source, tracer=None):
+        return self.load_with_cache(source, tracer)[0]
+
+    def load_with_cache(self, source, tracer=None):
+        # Returns (docs, served_from_loader_cache)
+        stale = None
+        if self.loader_cache is not None:
+            entry = self.loader_cache.lookup(source)
+            if entry is not None:
+                docs, fresh = entry
+                if fresh:
+                    return docs, True
+                stale = docs
+        docs = load_documents(source, tracer, stale)
+        # A 304 hands back the stale docs themselves; their content hash, and so the summary cache key, is unchanged
+        revalidated = stale is not None and docs is stale
+        if self.loader_cache is not None:
+            self.loader_cache.set(source, docs, revalidated)
+        return docs, revalidated
+
+    def prompt_template_for(self, request):
+        if request.prompt_template:
+            return request.prompt_template
+        return build_prompt_template(request.summary_type, request.word_count, request.language)
+
+    def route(self, docs, request, token_count=None):
+        if token_count is None:
+            token_count = count_document_tokens(docs)
+        return route_model(token_count, request.word_count, self.prompt_template_for(request), request.auto_models,
+                           self.scheduler.limits)
+
+    def plan(self, docs, request, token_count=None):
+        # Count tokens up front: stuff when the text fits the model, map_reduce otherwise
+        return plan_chain(docs, request.model, request.word_count, self.prompt_template_for(request),
+                          request.chain_type, token_count)
+
+    def extract(self, docs, request):
+        # Offline models pick sentences from the source, so the output stays in the source language
+        return textrank_summary(docs, request.word_count, bullets=request.summary_type.endswith("Key Points Only"))
+
+    def summarize(self, docs, request, plan=None, on_token=None, tracer=None, chunks=None):
+        if request.model in LOCAL_MODELS:
+            return self.extract(docs, request)[0]
+        template = self.prompt_template_for(request)
+        if plan is None:
+            plan = self.plan(docs, request)
+
+        llm = self.llm_factory(request.model, request.api_key)
+        output_tokens = output_token_budget(request.word_count)
+        if plan.chain_type == "stuff":
+            return run_stuff(llm, docs, template, plan, self.scheduler, request.model, output_tokens, on_token, tracer)
+        if plan.chain_type == "refine":
+            return run_refine(llm, docs, template, plan, self.scheduler, request.model, output_tokens, on_token, tracer,
+                              chunks)
+        # Chunk summaries are cached per (chunk, model), so changing the options only redoes the combine call
+        chunk_cache = self.summary_cache if request.use_cache else None
+        return run_map_reduce(llm, docs, template, plan, self.scheduler, request.model, output_tokens, on_token, tracer,
+                              chunks, chunk_cache)
+
+    def analyze(self, original_text, request, tracer=None, stats=None):
+        return analyze_content(
+            original_text,
+            sentiment=request.enable_sentiment,
+            keywords=request.enable_keywords,
+            readability=request.enable_readability,
+            wordcloud=request.enable_wordcloud,
+            tracer=tracer,
+            stats=stats
+        )
+
+    def export(self, result):
+        if result.trace is not None:
+            # Pick up spans added after run() returned
+            result.timings = result.trace.timings
+            result.spans = result.trace.to_list()
+        result.export_json = {
+            'summary': result.summary,
+            'metadata': {
+                'source': result.content_info,
+                'processing_time': result.processing_time,
+                'timings': result.timings,
+                'spans': result.spans,
+                'cache_hit': result.cache_hit,
+                'loader_cache_hit': result.loader_cache_hit,
+                'near_duplicate': result.near_duplicate,
+                'chain': result.chain,
+                'routing': result.routing,
+                'compression': result.compression,
+                'time_to_first_token': result.time_to_first_token,
+                'model': result.model,
+                'language': result.language,
+                'summary_type': result.summary_type,
+                'timestamp': result.timestamp.isoformat()
+            },
+            'analysis': result.analysis
+        }
+        result.export_text = f"""
+AI Content Summary Report
+========================
+
+SOURCE INFORMATION:
+- Type: {result.content_info['type']}
+- Source: {result.content_info['source']}
+- Generated: {result.timestamp.strftime("%Y-%m-%d %H:%M:%S")}
+- Model: {result.model}
+- Language: {result.language}
+- Summary Type: {result.summary_type}
+
+PROCESSING METRICS:
+- Processing Time: {result.processing_time:.1f} seconds
+- Original Words: {result.original_words}
+- Summary Words: {result.summary_words}
+- Compression Ratio: {result.compression_ratio:.1f}x
+- Served From Cache: {'Yes' if result.cache_hit else 'No'}
+
+SUMMARY:
+{result.summary}
+
+ANALYSIS RESULTS:
+{json.dumps(result.analysis, indent=2) if result.analysis else 'No analysis performed'}
+
+Generated by AI Content Summarizer Pro
+"""
+        return result
+
+    def run(self, request, progress=None, on_token=None):
+        # progress(stage, percent) lets a UI mirror the stages as they start;
+        # on_token(text) switches the final LLM call to streaming
+        def report(stage, percent):
+            if progress is not None:
+                progress(stage, percent)
+
+        tracer = Tracer()
+        first_token = []
+
+        def stream_token(text):
+            if not first_token:
+                first_token.append(tracer.elapsed)
+            on_token(text)
+
+        with tracer.span("resolve"):
+            content_info = self.resolve(request.source)
+
+        def timed_validate():
+            with tracer.span("validate"):
+                self.validate(request.api_key)
+
+        # Key validation is a network round-trip of its own, so overlap it with loading.
+        # Local models never call Groq, so they need no key at all.
+        local = request.model in LOCAL_MODELS
+        report("validate", 10)
+        validation = None if local else self._executor.submit(timed_validate)
+
+        # Hashing and analysis stream the documents chunk by chunk instead of
+        # joining them, so large transcripts are not copied several times over
+        def timed_analyze(chunks):
+            with tracer.span("analyze"):
+                # One tokenization feeds the word count and every analysis
+                with tracer.span("tokenize_text"):
+                    stats = TextStats.from_chunks(chunks)
+                return self.analyze(None, request, tracer, stats), stats.word_count
+
+        # With a fixed Groq model the chunk size is known before loading, so file pages
+        # can be token-counted and split while later pages are still being parsed
+        split_budget = None
+        if not local and request.model != AUTO_MODEL and not request.extractive:
+            split_budget = map_input_budget(request.model)
+
+        def timed_prepare(pages):
+            with tracer.span("prepare_pages") as span:
+                splitter = text_splitter(split_budget) if split_budget else None
+                tokens, chunks = 0, []
+                for page in pages:
+                    tokens += count_tokens(page.page_content)
+                    if splitter is not None:
+                        chunks.extend(splitter.split_documents([page]))
+                span.set(token_count=tokens, chunks=len(chunks))
+                return tokens, (chunks if splitter is not None else None)
+
+        report("load", 30)
+        load_error = None
+        analysis = None
+        prepared = None
+        try:
+            with tracer.span("load", source_type=request.source.kind) as span:
+                if request.source.kind == "file":
+                    # Analysis and chunking consume the pages as they are parsed
+                    analysis_feed, prepare_feed = queue.Queue(), queue.Queue()
+                    texts = (page.page_content for page in iter(analysis_feed.get, None))
+                    analysis = self._executor.submit(timed_analyze, texts)
+                    prepared = self._executor.submit(timed_prepare, iter(prepare_feed.get, None))
+                    docs = []
+                    percent = 30
+                    for page in _fan_out(iter_file_pages(request.source.value), (analysis_feed, prepare_feed)):
+                        docs.append(page)
+                        total = page.metadata.get('total_pages')
+                        if total:
+                            # Loading owns 30-50%; per-page progress keeps the UI alive through long reports
+                            page_percent = 30 + 20 * page.metadata['page'] // total
+                            if page_percent > percent:
+                                percent = page_percent
+                                report("load", percent)
+                    loader_cache_hit = False
+                else:
+                    docs, loader_cache_hit = self.load_with_cache(request.source, tracer)
+                span.set(loader_cache_hit=loader_cache_hit, documents=len(docs))
+        except SourceLoadError as e:
+            load_error = e
+
+        # An invalid key wins over a load failure, matching the old serial order
+        if validation is not None:
+            with tracer.span("validate_wait"):
+                validation.result()
+        if load_error is not None:
+            raise load_error
+
+        # Analysis only needs the text, so it runs while the LLM works on the summary
+        if analysis is None:
+            analysis = self._executor.submit(timed_analyze, iter_text_chunks(docs))
+
+        token_count = None
+        chunks = None
+        if prepared is not None:
+            with tracer.span("prepare_wait"):
+                token_count, chunks = prepared.result()
+
+        budget = None
+        if request.extractive and not local:
+            if token_count is None:
+                with tracer.span("count_tokens"):
+                    token_count = count_document_tokens(docs)
+            budget = compression_budget(token_count)
+
+        # The Auto model is resolved before the cache lookup, which is keyed by the real model.
+        # With compression the LLM sees at most ``budget`` tokens, so route on that.
+        routing = None
+        if request.model == AUTO_MODEL:
+            with tracer.span("route") as span:
+                if token_count is None:
+                    token_count = count_document_tokens(docs)
+                routing = self.route(docs, request, min(token_count, budget or token_count))
+                span.set(model=routing.model, token_count=routing.token_count, fits=routing.fits)
+            request = replace(request, model=routing.model)
+
+        output_summary = None
+        cache_key = None
+        near_duplicate = None
+        use_cache = self.summary_cache is not None and request.use_cache
+        signature = None
+        if use_cache and self.duplicate_index is not None:
+            def timed_signature():
+                with tracer.span("fingerprint"):
+                    return minhash_signature(iter_text_chunks(docs))
+
+            signature = self._executor.submit(timed_signature)
+
+        def params_key(digest):
+            return summary_cache_key(
+                None,
+                request.model,
+                request.summary_type,
+                request.word_count,
+                request.language,
+                request.prompt_template,
+                digest=digest,
+                variant="extractive" if budget else None
+            )
+
+        if use_cache:
+            with tracer.span("cache") as span:
+                digest = content_hash(iter_text_chunks(docs))
+                cache_key = params_key(digest)
+                output_summary = self.summary_cache.get(cache_key)
+                span.set(hit=output_summary is not None)
+
+            if output_summary is None and signature is not None:
+                # Same content under another URL (syndication, re-uploads): reuse its summary
+                with tracer.span("near_duplicate") as span:
+                    matches = self.duplicate_index.find(signature.result(), exclude=digest)
+                    # Sources whose summaries have all expired or been evicted are dead candidates
+                    live = self.summary_cache.stored_digests(match for match, _ in matches)
+                    self.duplicate_index.remove([match for match, _ in matches if match not in live])
+                    for match, score in matches:
+                        if match not in live:
+                            continue
+                        output_summary = self.summary_cache.get(params_key(match))
+                        if output_summary is not None:
+                            near_duplicate = {'digest': match, 'similarity': score}
+                            self.summary_cache.set(cache_key, output_summary, digest)
+                            break
+                    span.set(hit=near_duplicate is not None, pruned=len(matches) - len(live))
+        cache_hit = output_summary is not None
+
+        plan = None
+        chain = None
+        compression = None
+        llm_docs = docs
+        if not cache_hit and budget:
+            report("compress", 50)
+            with tracer.span("compress", budget=budget) as span:
+                llm_docs, compression = compress_documents(docs, budget, self.embedder)
+                span.set(**compression)
+            token_count = None
+
+        if not cache_hit and local:
+            report("chain", 70)
+            with tracer.span("chain", chain_type="textrank", model=request.model) as span:
+                output_summary, chain = self.extract(docs, request)
+                span.set(sentences=chain['sentences'], iterations=chain['iterations'])
+            if on_token:
+                stream_token(output_summary)
+            if cache_key is not None:
+                self.summary_cache.set(cache_key, output_summary, digest)
+        elif not cache_hit:
+            with tracer.span("tokenize") as span:
+                plan = self.plan(llm_docs, request, token_count)
+                span.set(token_count=plan.token_count, chain_type=plan.chain_type)
+            report("chain", 70)
+            with tracer.span("chain", chain_type=plan.chain_type, model=request.model) as span:
+                output_summary = self.summarize(llm_docs, request, plan, on_token=stream_token if on_token else None,
+                                                tracer=tracer, chunks=chunks)
+                span.set(llm_calls=plan.llm_calls, chunks=plan.chunk_count, cached_chunks=plan.cached_chunks)
+            chain = asdict(plan)
+            if cache_key is not None:
+                self.summary_cache.set(cache_key, output_summary, digest)
+        if signature is not None:
+            self.duplicate_index.add(digest, signature.result())
+
+        report("analyze", 90)
+        with tracer.span("analyze_wait"):
+            analysis_results, original_words = analysis.result()
+
+        result = SummaryResult(
+            summary=output_summary,
+            content_info=content_info,
+            model=request.model,
+            language=request.language,
+            summary_type=request.summary_type,
+            original_words=original_words,
+            analysis=analysis_results,
+            cache_hit=cache_hit,
+            loader_cache_hit=loader_cache_hit,
+            near_duplicate=near_duplicate,
+            chain=chain,
+            routing=asdict(routing) if routing is not None else None,
+            compression=compression,
+            time_to_first_token=first_token[0] if first_token else None,
+            trace=tracer
+        )
+        result.processing_time = tracer.elapsed
+
+        with tracer.span("export"):
+            self.export(result)
+        # Re-read so the export span itself is on the result
+        result.timings = tracer.timings
+        result.spans = tracer.to_list()
+
+        report("done", 100)
+        return result
@@ -0,0 +1,81 @@
+# Prompt templates for every summary type offered in the UI
+
+prompt_templates = {
+    "📋 Standard Summary": """
+    Create a comprehensive summary of the following content in {word_count} words in {language}.
+
+    Structure:
+    1. **Overview**: Brief introduction to the main topic
+    2. **Key Points**: Most important information and details
+    3. **Conclusion**: Final thoughts and takeaways
+
+    Content: {text}
+    """,
+    "🎯 Executive Summary": """
+    Create an executive summary of the following content in {word_count} words in {language}.
+    Focus on key business insights, decisions, and strategic points.
+
+    Structure:
+    1. **Executive Overview**: High-level summary for decision makers
+    2. **Key Findings**: Most critical insights and data
+    3. **Recommendations**: Actionable next steps
+
+    Content: {text}
+    """,
+    "📖 Detailed Analysis": """
+    Provide a detailed analysis of the following content in {word_count} words in {language}.
+    Include thorough examination of all major points and their implications.
+
+    Structure:
+    1. **Introduction**: Context and background
+    2. **Detailed Analysis**: Comprehensive breakdown of key elements
+    3. **Implications**: What this means and potential impact
+
+    Content: {text}
+    """,
+    "🔍 Key Points Only": """
+    Extract and present only the most important key points from the following content in {word_count} words in {language}.
+    Focus on actionable insights and critical information.
+
+    Format as numbered list:
+    1. **Point 1**: Brief but comprehensive explanation
+    2. **Point 2**: Brief but comprehensive explanation
+    [Continue for all key points]
+
+    Content: {text}
+    """,
+    "💡 Insights & Takeaways": """
+    Provide key insights and actionable takeaways from the following content in {word_count} words in {language}.
+    Focus on what readers should learn and how they can apply this information.
+
+    Structure:
+    1. **Key Insights**: Most important discoveries and learnings
+    2. **Actionable Takeaways**: Practical steps and applications
+    3. **Future Implications**: What this means going forward
+
+    Content: {text}
+    """,
+    "📊 Structured Report": """
+    Create a structured report of the following content in {word_count} words in {language}.
+    Present information in a professional, organized manner.
+
+    Structure:
+    1. **Executive Summary**: Brief overview
+    2. **Main Findings**: Detailed breakdown
+    3. **Data Points**: Key statistics and facts
+    4. **Conclusions**: Final analysis and recommendations
+
+    Content: {text}
+    """
+}
+
+
+def build_prompt_template(summary_type, word_count, language):
+    # Fill in everything except the content so the result can back a
+    # PromptTemplate with a single "text" input variable
+    selected_prompt = prompt_templates.get(summary_type, prompt_templates["📋 Standard Summary"])
+    return selected_prompt.format(
+        text="{text}",
+        word_count=word_count,
+        language=language
+    )
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+from summarizer.chains import count_tokens, input_token_budget, output_token_budget
+from summarizer.config import DEFAULT_RATE_LIMIT, model_info, rate_limits
+
+
+@dataclass
+class RoutingDecision:
+    model: str
+    token_count: int
+    # True when the content fits the chosen model in a single call
+    fits: bool
+    reason: str
+    candidates: list
+
+
+def single_call_budget(model, word_count, template, limits=None):
+    # Groq rejects a request larger than the model's tokens-per-minute limit outright,
+    # so a call must fit that as well as the context window
+    tokens_per_minute = (limits or rate_limits).get(model, DEFAULT_RATE_LIMIT)[1]
+    tpm_budget = tokens_per_minute - output_token_budget(word_count) - count_tokens(template)
+    return min(input_token_budget(model, word_count, template), tpm_budget)
+
+
+def route_model(token_count, word_count, template, candidates=None, limits=None):
+    """Pick the fastest model that can summarize ``token_count`` tokens in one call.
+
+    Candidates are tried by ``speed_rank`` from model_info, preferring the
+    larger context window on ties. A model fits when the content, prompt and
+    output are within both its context window and its tokens-per-minute
+    limit (``limits``, default: config.rate_limits). When nothing fits, the
+    fastest candidate is returned with ``fits=False`` and the caller falls
+    back to map_reduce.
+    """
+    candidates = [m for m in (candidates or model_info) if m in model_info] or list(model_info)
+    ranked = sorted(candidates, key=lambda m: (model_info[m]['speed_rank'], -model_info[m]['context_window']))
+
+    for model in ranked:
+        budget = single_call_budget(model, word_count, template, limits)
+        if token_count <= budget:
+            return RoutingDecision(model, token_count, True,
+                                   f"fastest model that fits {token_count} tokens in one call", ranked)
+
+    model = ranked[0]
+    return RoutingDecision(model, token_count, False,
+                           f"{token_count} tokens exceed every model's context window or tokens-per-minute limit; "
+                           f"chunked with the fastest model", ranked)
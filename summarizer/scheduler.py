@@ -0,0 +1,223 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from summarizer.clients import ClientPool, close_chat_groq
+from summarizer.config import DEFAULT_RATE_LIMIT, rate_limits
+
+
+_STREAM_DONE = object()
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to ``per_minute`` units.
+
+    A request larger than the whole bucket could never be covered. Instead of
+    waiting for a full bucket it goes once nothing is owed, and its charge
+    (capped at one bucket) can push the level negative; later requests then
+    wait off the debt, so the average rate still holds.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        needed = amount if amount <= self.capacity else 0.0
+        self.refill()
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+
+class ModelLimiter:
+    """Requests/min and tokens/min buckets for one model."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, tokens):
+        while True:
+            delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if delay <= 0:
+                # No await between the check and the take, so this is atomic on the loop
+                self.requests.take(1)
+                self.tokens.take(tokens)
+                return
+            await asyncio.sleep(delay)
+
+
+def is_rate_limit_error(exc):
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(exc):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Rate-limit-aware executor for chat model calls.
+
+    All calls run on one background event loop shared by every caller, so the
+    per-model buckets and the concurrency bound hold across Streamlit sessions
+    and worker threads. Rate-limited calls back off exponentially, preferring
+    the server's Retry-After when it sends one.
+
+    ``clients`` pools the chat clients used on this scheduler's loop: their
+    async HTTP connections belong to that loop and cannot be shared with
+    another scheduler's.
+    """
+
+    def __init__(self, max_concurrency=4, limits=None, max_retries=5, base_delay=1.0, max_delay=60.0, client_pool=None):
+        self.max_concurrency = max_concurrency
+        self.limits = dict(rate_limits, **(limits or {}))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters = {}
+        self._semaphore = None
+        self._loop = None
+        self._lock = threading.Lock()
+        self.clients = client_pool if client_pool is not None else ClientPool(closer=self.close_client)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-scheduler", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro):
+        return self.submit(coro).result()
+
+    def close_client(self, llm):
+        closing = close_chat_groq(llm)
+        if closing is None:
+            return
+        with self._lock:
+            loop = self._loop
+        if loop is None:
+            # Never ran on a loop, so there are no async connections to close
+            closing.close()
+        else:
+            asyncio.run_coroutine_threadsafe(closing, loop)
+
+    def limiter(self, model):
+        if model not in self._limiters:
+            rpm, tpm = self.limits.get(model, DEFAULT_RATE_LIMIT)
+            self._limiters[model] = ModelLimiter(rpm, tpm)
+        return self._limiters[model]
+
+    def backoff_delay(self, attempt, exc):
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    async def call(self, model, tokens, make_call, tracer=None, **span_attributes):
+        # make_call() returns a fresh awaitable for every attempt
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = self.limiter(model)
+        attempt = 0
+        queued = 0.0
+        start = time.perf_counter()
+        while True:
+            waiting = time.perf_counter()
+            await limiter.acquire(tokens)
+            async with self._semaphore:
+                queued += time.perf_counter() - waiting
+                try:
+                    response = await make_call()
+                except Exception as exc:
+                    if not is_rate_limit_error(exc) or attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff_delay(attempt, exc)
+                else:
+                    if tracer is not None:
+                        # Runs on the scheduler thread, so the parent span is passed in
+                        tracer.record("llm_call", start, model=model, tokens=tokens,
+                                      attempts=attempt + 1, queued=queued, **span_attributes)
+                    return response
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def ainvoke(self, llm, model, prompt, tokens, tracer=None, **span_attributes):
+        # Leased while queued and retried too, so the pool never closes a client a call is waiting on
+        with self.clients.lease(llm):
+            message = await self.call(model, tokens, lambda: llm.ainvoke(prompt), tracer, **span_attributes)
+        return getattr(message, "content", message)
+
+    async def ainvoke_many(self, llm, model, prompts, tokens, tracer=None, **span_attributes):
+        return await asyncio.gather(*(
+            self.ainvoke(llm, model, prompt, prompt_tokens, tracer, **span_attributes)
+            for prompt, prompt_tokens in zip(prompts, tokens)
+        ))
+
+    def invoke(self, llm, model, prompt, tokens, tracer=None, **span_attributes):
+        return self.run(self.ainvoke(llm, model, prompt, tokens, tracer, **span_attributes))
+
+    def invoke_many(self, llm, model, prompts, tokens, tracer=None, **span_attributes):
+        return self.run(self.ainvoke_many(llm, model, prompts, tokens, tracer, **span_attributes))
+
+    async def _pump(self, llm, prompt, chunks):
+        started = False
+        try:
+            async for chunk in llm.astream(prompt):
+                text = getattr(chunk, "content", chunk)
+                if text:
+                    started = True
+                    chunks.put(text)
+        except Exception as exc:
+            # Once tokens went out a retry would duplicate them, so don't look like a 429
+            if started:
+                raise RuntimeError(f"LLM stream interrupted: {exc}") from exc
+            raise
+
+    def stream(self, llm, model, prompt, tokens, tracer=None, **span_attributes):
+        """Yield text chunks on the caller's thread as the model produces them."""
+        with self.clients.lease(llm):
+            chunks = queue.Queue()
+            future = self.submit(self.call(model, tokens, lambda: self._pump(llm, prompt, chunks), tracer, **span_attributes))
+            future.add_done_callback(lambda _: chunks.put(_STREAM_DONE))
+            while True:
+                item = chunks.get()
+                if item is _STREAM_DONE:
+                    break
+                yield item
+            future.result()
+
+
+# Shared by every pipeline in the process that does not bring its own, so
+# Streamlit sessions share the rate limits, one event loop and warm clients
+default_scheduler = LLMScheduler()
@@ -0,0 +1,28 @@
+import threading
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def shared_session(name, headers=None, pool_connections=4, pool_maxsize=16):
+    """Return the process-wide keep-alive ``requests`` session called ``name``.
+
+    Created on first use with the given default headers and connection pool
+    sizes; later calls return the same session, so repeat requests to a host
+    skip the TLS handshake. requests advertises gzip, and br too when brotli
+    is installed.
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if headers:
+                session.headers.update(headers)
+            _sessions[name] = session
+        return session
@@ -0,0 +1,89 @@
+import os
+from dataclasses import dataclass
+
+from summarizer.config import youtube_languages
+from summarizer.exceptions import SourceLoadError
+
+
+@dataclass(frozen=True)
+class ContentSource:
+    kind: str  # "url", "wikipedia", "text" or "file" (a local PDF/TXT/MD path)
+    value: str
+    # YouTube only: also fetch title/author/views (an extra page request per video)
+    video_info: bool = False
+
+    @property
+    def is_youtube(self):
+        return self.kind == "url" and is_youtube_url(self.value)
+
+
+def is_youtube_url(url):
+    return "youtube.com" in url or "youtu.be" in url
+
+
+def resolve_source(url=None, wikipedia_query=None, text=None, file_path=None):
+    import validators
+
+    # Same precedence as the UI tabs: URL, then Wikipedia, then direct text, then an uploaded file
+    if url and validators.url(url):
+        return ContentSource("url", url)
+    elif wikipedia_query:
+        return ContentSource("wikipedia", wikipedia_query)
+    elif text:
+        return ContentSource("text", text)
+    elif file_path:
+        return ContentSource("file", file_path)
+    return None
+
+
+def describe_source(source):
+    if source.kind == "url":
+        if source.is_youtube:
+            return {'type': 'YouTube Video', 'source': source.value}
+        return {'type': 'Website', 'source': source.value}
+    elif source.kind == "wikipedia":
+        return {'type': 'Wikipedia Article', 'source': f"Wikipedia: {source.value}"}
+    elif source.kind == "file":
+        name = os.path.basename(source.value)
+        return {'type': 'PDF Document' if name.lower().endswith(".pdf") else 'Text File', 'source': name}
+    return {'type': 'Direct Text', 'source': 'User Input'}
+
+
+def load_documents(source, tracer=None, cached=None):
+    # ``cached``: stale Documents from the loader cache, revalidated instead of re-downloaded when possible
+    if source.kind == "url":
+        url = source.value
+        try:
+            if source.is_youtube:
+                from langchain_community.document_loaders import YoutubeLoader
+
+                loader = YoutubeLoader.from_youtube_url(
+                    url,
+                    add_video_info=source.video_info,
+                    language=youtube_languages
+                )
+                return loader.load()
+            from summarizer.web import load_web_page
+
+            # Readability over a pooled session; the Unstructured stack only loads when that fails
+            return load_web_page(url, tracer, cached)
+        except Exception as e:
+            raise SourceLoadError(f"Failed to load content from URL: {e}") from e
+
+    elif source.kind == "wikipedia":
+        from langchain_community.document_loaders import WikipediaLoader
+
+        try:
+            return WikipediaLoader(query=source.value, load_max_docs=1).load()
+        except Exception as e:
+            raise SourceLoadError(f"Failed to load content from Wikipedia: {e}") from e
+
+    elif source.kind == "file":
+        from summarizer.files import iter_file_pages
+
+        # Pipeline.run consumes the pages as they are parsed; this is the all-at-once path
+        return list(iter_file_pages(source.value))
+
+    # Create a document from direct text
+    from langchain.schema import Document
+    return [Document(page_content=source.value)]
@@ -0,0 +1,139 @@
+import re
+
+from summarizer.analysis import stop_words
+from summarizer.compress import WINDOW_WORDS, regex_sentences, split_sentences
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+# A sentence this similar to one already picked adds nothing to the summary
+MAX_OVERLAP = 0.8
+
+_word_re = re.compile(r'\w+')
+
+
+def punkt_sentences(text):
+    # punkt is downloaded by the app on start-up; headless runs without it use a plain regex
+    try:
+        from nltk.tokenize import sent_tokenize
+        return sent_tokenize(text)
+    except (ImportError, LookupError):
+        return regex_sentences(text)
+
+
+class SentenceGraph:
+    """TF-IDF sentence vectors with the cosine-similarity graph kept in factored form.
+
+    The similarity matrix is S = X Xᵀ with its diagonal removed, where X is the
+    L2-normalized sentence-term matrix. X is stored as COO arrays and products
+    with S are two ``bincount`` passes over its non-zeros, so a power-iteration
+    step costs O(non-zeros) and the n x n matrix is never built, which keeps
+    100K-sentence transcripts in memory.
+    """
+
+    def __init__(self, sentences):
+        import numpy as np
+
+        vocabulary = {}
+        ids, lengths = [], []
+        for sentence in sentences:
+            words = [vocabulary.setdefault(w, len(vocabulary)) for w in _word_re.findall(sentence.lower())
+                     if w not in stop_words]
+            ids.extend(words)
+            lengths.append(len(words))
+
+        self.size = len(sentences)
+        self.terms = len(vocabulary)
+        # One sorted (sentence, term) key per occurrence; unique counts give the term frequencies
+        keys = np.repeat(np.arange(self.size, dtype=np.int64), lengths) * self.terms + np.array(ids, dtype=np.int64)
+        keys, tf = np.unique(keys, return_counts=True)
+        self.rows = keys // max(1, self.terms)
+        self.cols = keys % max(1, self.terms)
+        df = np.bincount(self.cols, minlength=self.terms)
+        # Sublinear tf with smoothed idf, so terms present in every sentence still count a little
+        weights = (1 + np.log(tf)) * (np.log((1 + self.size) / (1 + df)) + 1)[self.cols]
+        norms = np.sqrt(np.bincount(self.rows, weights=weights ** 2, minlength=self.size))
+        self.weights = weights / norms[self.rows]
+        # Rows are built in sentence order, so row i is the slice indptr[i]:indptr[i + 1]
+        self.indptr = np.searchsorted(self.rows, np.arange(self.size + 1))
+        self._self_similarity = np.bincount(self.rows, weights=self.weights ** 2, minlength=self.size)
+
+    def dot(self, vector):
+        # S @ vector without materializing S
+        import numpy as np
+
+        projected = np.bincount(self.cols, weights=self.weights * vector[self.rows], minlength=self.terms)
+        return np.bincount(self.rows, weights=self.weights * projected[self.cols], minlength=self.size) \
+            - self._self_similarity * vector
+
+    def vector(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(zip(self.cols[start:end].tolist(), self.weights[start:end].tolist()))
+
+
+def textrank_scores(graph, damping=DAMPING, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+    """PageRank over the weighted sentence graph; returns (scores, iterations)."""
+    import numpy as np
+
+    n = graph.size
+    degree = graph.dot(np.ones(n))
+    dangling = degree <= 1e-12
+    inverse_degree = np.divide(1.0, degree, out=np.zeros(n), where=~dangling)
+
+    scores = np.full(n, 1.0 / n)
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        # Sentences sharing no terms with any other spread their rank uniformly
+        updated = (1 - damping) / n + damping * (graph.dot(scores * inverse_degree) + scores[dangling].sum() / n)
+        delta = np.abs(updated - scores).sum()
+        scores = updated
+        if delta < tolerance:
+            break
+    return scores, iteration
+
+
+def select_ranked(graph, sentences, scores, word_count, max_overlap=MAX_OVERLAP):
+    # Best first until the word budget is spent, skipping near-repeats; returned in document order
+    import numpy as np
+
+    selected = []
+    vectors = []
+    words = 0
+    for i in np.argsort(-scores, kind="stable").tolist():
+        length = len(sentences[i].split())
+        if words + length > word_count:
+            continue
+        vector = graph.vector(i)
+        if any(sum(w * other.get(t, 0.0) for t, w in vector.items()) > max_overlap for other in vectors):
+            continue
+        selected.append(i)
+        vectors.append(vector)
+        words += length
+        if word_count - words < WINDOW_WORDS // 4:
+            break
+    return sorted(selected)
+
+
+def textrank_summary(docs, word_count, bullets=False):
+    """Extractive summary of about ``word_count`` words; returns (summary, info)."""
+    sentences = list(split_sentences(docs, punkt_sentences))
+    info = {'chain_type': "textrank", 'sentences': len(sentences), 'selected_sentences': 0, 'iterations': 0}
+    if not sentences:
+        return "", info
+
+    if sum(len(s.split()) for s in sentences) <= word_count:
+        selected = list(range(len(sentences)))
+    else:
+        graph = SentenceGraph(sentences)
+        scores, info['iterations'] = textrank_scores(graph)
+        selected = select_ranked(graph, sentences, scores, word_count)
+        if not selected:
+            # Every sentence is longer than the budget: cut the top-ranked one down to it
+            best = int(scores.argmax())
+            sentences[best] = " ".join(sentences[best].split()[:word_count])
+            selected = [best]
+
+    info['selected_sentences'] = len(selected)
+    picked = [sentences[i] for i in selected]
+    summary = "\n".join(f"- {s}" for s in picked) if bullets else " ".join(picked)
+    return summary, info
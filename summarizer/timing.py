@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Callables invoked with every finished span dict, for external collectors
+span_listeners = []
+
+
+def add_span_listener(listener):
+    span_listeners.append(listener)
+
+
+def remove_span_listener(listener):
+    if listener in span_listeners:
+        span_listeners.remove(listener)
+
+
+class Span:
+    def __init__(self, name, start, parent=None, attributes=None):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Collects timed spans for one pipeline run.
+
+    Spans nest per thread; work done on other threads (key validation, the
+    LLM scheduler loop) is attached with an explicit ``parent``. ``timings``
+    keeps the old flat name -> seconds view for dashboards and exports.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1].name
+        span = Span(name, time.perf_counter(), parent, attributes)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            self._finish(span)
+
+    def record(self, name, start, end=None, parent=None, **attributes):
+        """Add a span measured elsewhere from perf_counter() timestamps."""
+        span = Span(name, start, parent, attributes)
+        self._finish(span, end)
+        return span
+
+    def _finish(self, span, end=None):
+        span.end = end if end is not None else time.perf_counter()
+        with self._lock:
+            self.spans.append(span)
+        if span_listeners:
+            data = self.span_dict(span)
+            for listener in list(span_listeners):
+                listener(data)
+
+    def span_dict(self, span):
+        return {
+            'name': span.name,
+            'parent': span.parent,
+            'start': span.start - self.started,
+            'duration': span.duration,
+            'attributes': span.attributes,
+        }
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def timings(self):
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in sorted(spans, key=lambda s: s.start):
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def to_list(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [self.span_dict(span) for span in spans]
+
+
+def maybe_span(tracer, name, **attributes):
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, **attributes)
+
+
+class JsonLinesSpanExporter:
+    """Span listener that appends every finished span to a JSONL file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(span, default=str) + "\n")
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+
+from summarizer.config import USER_AGENT
+from summarizer.sessions import shared_session
+from summarizer.timing import maybe_span
+
+# (connect, read) seconds per page fetch
+FETCH_TIMEOUT = (3.05, 20)
+# Bodies are read in chunks and cut off here; readability copes with a truncated tail
+MAX_PAGE_BYTES = 8 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+# Less extracted text than this means readability missed the article (index page, paywall, SPA shell)
+MIN_ARTICLE_WORDS = 50
+
+_html_types = ("text/html", "application/xhtml+xml")
+
+
+def web_session():
+    # One keep-alive session for every page fetch
+    return shared_session(
+        "web",
+        headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"},
+        pool_connections=16,
+        pool_maxsize=16
+    )
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    status: int
+    content_type: str
+    body: bytes
+    truncated: bool
+    etag: str = None
+    last_modified: str = None
+
+    @property
+    def is_html(self):
+        return self.content_type.startswith(_html_types)
+
+
+def fetch_page(url, max_bytes=MAX_PAGE_BYTES, etag=None, last_modified=None):
+    """GET ``url`` over the shared session, reading at most ``max_bytes`` of the decoded body.
+
+    With ``etag`` or ``last_modified`` from an earlier response the request is
+    conditional, and an unchanged page comes back as status 304 with no body.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with web_session().get(url, stream=True, timeout=FETCH_TIMEOUT, headers=headers) as response:
+        response.raise_for_status()
+        body = bytearray()
+        truncated = False
+        for chunk in response.iter_content(READ_CHUNK_BYTES):
+            body += chunk
+            if len(body) >= max_bytes:
+                truncated = True
+                del body[max_bytes:]
+                break
+        return FetchedPage(
+            url=response.url,
+            status=response.status_code,
+            content_type=response.headers.get("Content-Type", "").lower(),
+            body=bytes(body),
+            truncated=truncated,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+
+
+def extract_article(body, url=None):
+    """Return (title, text) of the main article in an HTML page, or None when there is none."""
+    try:
+        from bs4 import BeautifulSoup
+        from readability import Document as ReadableDocument
+
+        # Bytes, so readability can honour the page's own charset declaration
+        article = ReadableDocument(body, url=url)
+        html = article.summary(html_partial=True)
+        title = article.short_title()
+    except Exception:
+        return None
+
+    lines = (" ".join(line.split()) for line in BeautifulSoup(html, "lxml").get_text("\n").splitlines())
+    text = "\n\n".join(line for line in lines if line)
+    if len(text.split()) < MIN_ARTICLE_WORDS:
+        return None
+    return title, text
+
+
+def load_unstructured(url):
+    from langchain_community.document_loaders import UnstructuredURLLoader
+
+    loader = UnstructuredURLLoader(
+        urls=[url],
+        ssl_verify=False,
+        headers={"User-Agent": USER_AGENT}
+    )
+    return loader.load()
+
+
+def load_web_page(url, tracer=None, cached=None):
+    """Load a web page as Documents: readability on the fetched HTML, Unstructured when that fails.
+
+    ``cached`` are the Documents from an earlier load; when they carry the
+    page's validators the fetch is conditional and a 304 returns them as-is.
+    """
+    import requests
+    from langchain.schema import Document
+
+    validators = cached[0].metadata if cached else {}
+    page = None
+    with maybe_span(tracer, "fetch", conditional=bool(validators.get('etag') or validators.get('last_modified'))) as span:
+        try:
+            page = fetch_page(url, etag=validators.get('etag'), last_modified=validators.get('last_modified'))
+        except requests.exceptions.RequestException as e:
+            # Unstructured gets its own try (no certificate check, its own parsing of odd responses)
+            if span is not None:
+                span.set(error=type(e).__name__)
+        if span is not None and page is not None:
+            span.set(status=page.status, bytes=len(page.body), truncated=page.truncated)
+
+    if page is not None and page.status == 304 and cached:
+        return cached
+
+    extracted = None
+    if page is not None and page.is_html:
+        with maybe_span(tracer, "extract") as span:
+            extracted = extract_article(page.body, page.url)
+            if span is not None:
+                span.set(extracted=extracted is not None)
+
+    if extracted is not None:
+        title, text = extracted
+        metadata = {'source': url, 'title': title}
+        # Stored with the loader cache so the next load of a stale entry can be conditional
+        if page.etag:
+            metadata['etag'] = page.etag
+        if page.last_modified:
+            metadata['last_modified'] = page.last_modified
+        return [Document(page_content=text, metadata=metadata)]
+
+    # PDFs, feeds and pages readability cannot make sense of
+    with maybe_span(tracer, "unstructured"):
+        return load_unstructured(url)
@@ -0,0 +1,48 @@
+import pytest
+
+from benchmarks.baselines import legacy_analyze_content
+from benchmarks.fixtures import notebook_speech, synthetic_transcript
+from summarizer.analysis import TextStats, analyze_content, iter_text_chunks
+
+TEXTS = [
+    notebook_speech(),
+    "Good, good, good! But a bad problem.",
+    "The results were great; the best season yet. No failure, no issue worth noting.",
+    *(synthetic_transcript(3000, seed=seed) for seed in range(5)),
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_legacy_sentiment_keywords_and_wordcloud(text):
+    legacy = legacy_analyze_content(text)
+    result = analyze_content(text, readability=False)
+    assert result['sentiment'] == legacy['sentiment']
+    assert result['keywords'] == legacy['keywords']
+    assert result['wordcloud'] == legacy['wordcloud']
+
+
+def test_sentiment_counts_which_words_appear_not_how_often():
+    # One positive word three times against two different negative ones
+    assert analyze_content("Good, good, good! But a bad problem.")['sentiment']['score'] == "Negative"
+
+
+def test_lexicon_words_match_whole_words_only():
+    # The one deliberate difference from the legacy substring check
+    assert legacy_analyze_content("The window was open.")['sentiment']['score'] == "Positive"
+    assert analyze_content("The window was open.")['sentiment']['score'] == "Neutral"
+
+
+def test_wordcloud_needs_keywords():
+    result = analyze_content("The window was open.", keywords=False)
+    assert 'keywords' not in result and 'wordcloud' not in result
+
+
+def test_streamed_chunks_give_the_same_stats():
+    class Doc:
+        def __init__(self, text):
+            self.page_content = text
+
+    text = TEXTS[0]
+    streamed = TextStats.from_documents([Doc(text)], chunk_chars=500)
+    assert len(list(iter_text_chunks([Doc(text)], 500))) > 1
+    assert analyze_content(None, readability=False, stats=streamed) == analyze_content(text, readability=False)
@@ -0,0 +1,19 @@
+import json
+
+from summarizer.batch import BatchRunner
+
+
+class EchoRunner(BatchRunner):
+    def run_row(self, row):
+        return {'id': row['id'], 'status': "ok", 'input': row}
+
+
+def test_skipped_counts_only_this_inputs_done_rows(tmp_path):
+    output = tmp_path / "out.jsonl"
+    # Results from another input share the output file
+    output.write_text("".join(json.dumps({'id': i, 'status': "ok"}) + "\n" for i in ("x", "y", "a")))
+    runner = EchoRunner(pipeline=None, api_key="key", workers=2)
+
+    counts = runner.run(iter([{'id': "a"}, {'id': "b"}]), str(output))
+    assert counts == {'skipped': 1, 'ok': 1, 'error': 0}
+    assert runner.run([{'id': "a"}, {'id': "b"}], str(output))['skipped'] == 2
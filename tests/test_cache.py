@@ -0,0 +1,70 @@
+import sqlite3
+
+from summarizer import cache
+from summarizer.cache import DiskCache, LRUCache, SummaryCache
+
+
+def test_memory_tier_expires_with_the_disk_copy(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    summaries = SummaryCache(disk=DiskCache(str(tmp_path / "summaries.sqlite3"), default_ttl=60))
+    summaries.set("key", "summary")
+    assert summaries.get("key") == "summary"
+
+    now[0] += 61
+    assert summaries.get("key") is None
+    assert len(summaries.memory) == 0
+
+
+def test_memory_tier_drops_entries_evicted_from_disk(tmp_path):
+    summaries = SummaryCache(disk=DiskCache(str(tmp_path / "summaries.sqlite3"), max_bytes=100))
+    summaries.set("old", "x" * 50)
+    summaries.set("new", "y" * 50)
+    assert summaries.disk.get("old") is None
+    assert summaries.get("old") is None
+    assert summaries.get("new") == "y" * 50
+
+
+def test_lru_entry_limit_and_expiry(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1, expires=10)
+    lru.set("b", 2)
+    lru.set("c", 3)
+    assert lru.get("a") is None and lru.get("b") == 2
+    lru.set("d", 4, expires=5)
+    now[0] = 6
+    assert lru.get("d") is None and lru.get("b") == 2
+
+
+def test_size_total_is_kept_without_rescanning(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    disk = DiskCache(path, max_bytes=1000)
+    disk.set("a", b"x" * 100)
+    disk.set("a", b"x" * 300)
+    disk.set("b", b"y" * 200)
+    disk.delete("b")
+    assert disk.total_bytes() == 300
+
+    # A second process writing the same file keeps the shared total right
+    DiskCache(path).set("c", b"z" * 50)
+    assert disk.total_bytes() == 350
+    total = sqlite3.connect(path).execute("SELECT SUM(size) FROM entries").fetchone()[0]
+    assert disk.total_bytes() == total
+
+    disk.clear()
+    assert disk.total_bytes() == 0
+
+
+def test_existing_cache_files_get_a_total(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+        " expires REAL, accessed REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO entries VALUES ('a', x'00', 40, NULL, 0)")
+    conn.commit()
+    conn.close()
+    assert DiskCache(path).total_bytes() == 40
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("langchain")
+
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.fixtures import synthetic_transcript
+from summarizer import chains
+from summarizer.cache import DiskCache, SummaryCache
+from summarizer.pipeline import SummarizationPipeline, SummaryRequest
+from summarizer.scheduler import LLMScheduler
+
+
+def test_map_reduce_reuses_chunk_summaries_across_options(tmp_path, monkeypatch):
+    from langchain.schema import Document
+
+    splits = []
+
+    def recording_split(docs, input_budget, tracer=None):
+        chunks = split_documents(docs, input_budget, tracer)
+        splits.append([chunk.page_content for chunk in chunks])
+        return chunks
+
+    split_documents = chains.split_documents
+    monkeypatch.setattr(chains, "split_documents", recording_split)
+
+    llm = FakeChatModel(latency=0, tokens_per_second=1e9)
+    pipeline = SummarizationPipeline(llm_factory=lambda model, api_key: llm, key_validator=lambda key: True,
+                                     summary_cache=SummaryCache(disk=DiskCache(str(tmp_path / "summaries.sqlite3"))),
+                                     scheduler=LLMScheduler(limits={"llama3-8b-8192": (10_000, 10_000_000)}))
+    docs = [Document(page_content=synthetic_transcript(30_000))]
+
+    first = SummaryRequest(source=None, api_key="key", model="llama3-8b-8192", chain_type="map_reduce")
+    first_plan = pipeline.plan(docs, first)
+    pipeline.summarize(docs, first, first_plan)
+    assert first_plan.chunk_count > 1
+    assert first_plan.cached_chunks == 0
+    assert llm.calls == first_plan.llm_calls > first_plan.chunk_count
+
+    # Type, length and language only change the combine prompt
+    llm.reset()
+    second = SummaryRequest(source=None, api_key="key", model="llama3-8b-8192", chain_type="map_reduce",
+                            summary_type="🎯 Executive Summary", word_count=500, language="Spanish")
+    second_plan = pipeline.plan(docs, second)
+    pipeline.summarize(docs, second, second_plan)
+    assert llm.calls == second_plan.llm_calls == 1
+    assert second_plan.cached_chunks == first_plan.llm_calls - 1
+    assert second_plan.chunk_count == first_plan.chunk_count
+    assert splits[0] == splits[1]
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+
+from summarizer import clients
+from summarizer.clients import ClientPool, close_chat_groq
+from summarizer.scheduler import LLMScheduler
+
+
+class FakeSDKClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncSDKClient:
+    def __init__(self):
+        self.closed_on = None
+
+    async def close(self):
+        self.closed_on = threading.current_thread().name
+
+
+class FakeResource:
+    def __init__(self, client):
+        self._client = client
+
+
+class FakeChatGroq:
+    def __init__(self, model, api_key):
+        self.model = model
+        self.client = FakeResource(FakeSDKClient())
+        self.async_client = FakeResource(FakeAsyncSDKClient())
+
+
+def test_idle_clients_are_closed(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    closed = []
+    pool = ClientPool(factory=FakeChatGroq, idle_ttl=10, closer=closed.append)
+    first = pool.get("m", "key")
+    assert pool.get("m", "key") is first
+
+    now[0] = 11
+    second = pool.get("m", "key")
+    assert second is not first
+    assert closed == [first]
+
+
+def test_overflowed_clients_are_closed_only_once_idle(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    closed = []
+    pool = ClientPool(factory=FakeChatGroq, idle_ttl=10, max_size=1, closer=closed.append)
+    first = pool.get("a", "key")
+    now[0] = 5
+    pool.get("b", "key")
+    assert len(pool) == 1 and closed == []
+
+    now[0] = 10.5
+    pool.get("b", "key")
+    assert closed == [first]
+    pool.clear()
+    assert len(closed) == 2
+
+
+def test_schedulers_do_not_share_clients():
+    one, two = LLMScheduler(), LLMScheduler()
+    one.clients.factory = two.clients.factory = FakeChatGroq
+    assert one.clients.get("m", "key") is not two.clients.get("m", "key")
+
+
+def test_scheduler_closes_async_client_on_its_loop():
+    scheduler = LLMScheduler()
+    scheduler.clients.factory = FakeChatGroq
+    llm = scheduler.clients.get("m", "key")
+    scheduler.run(asyncio.sleep(0))
+
+    scheduler.clients.clear()
+    scheduler.run(asyncio.sleep(0))
+    assert llm.client._client.closed
+    assert llm.async_client._client.closed_on == "llm-scheduler"
+
+
+def test_close_chat_groq_ignores_other_models():
+    assert close_chat_groq(object()) is None
+
+
+def test_clients_in_use_are_not_closed(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    closed = []
+    pool = ClientPool(factory=FakeChatGroq, idle_ttl=600, closer=closed.append)
+    busy = pool.get("mixtral", "key-A")
+    with pool.lease(busy):
+        now[0] = 601
+        pool.get("gemma", "key-B")
+        assert closed == []
+        assert pool.get("mixtral", "key-A") is busy
+
+    # Idle is timed from the end of the last call, not from checkout
+    now[0] = 1000
+    pool.get("gemma", "key-B")
+    assert closed == []
+    now[0] = 1202
+    pool.get("gemma", "key-B")
+    assert closed == [busy]
+
+
+def test_retired_clients_in_use_are_not_closed(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    closed = []
+    pool = ClientPool(factory=FakeChatGroq, idle_ttl=10, max_size=1, closer=closed.append)
+    busy = pool.get("a", "key")
+    with pool.lease(busy):
+        now[0] = 1
+        pool.get("b", "key")
+        now[0] = 20
+        pool.get("b", "key")
+        pool.clear()
+        assert busy not in closed
+    now[0] = 31
+    pool.get("c", "key")
+    assert busy in closed
+
+
+def test_scheduler_calls_hold_a_lease():
+    scheduler = LLMScheduler(limits={"m": (10_000, 10_000_000)})
+    seen = []
+
+    class LeaseChecking(FakeChatGroq):
+        async def ainvoke(self, prompt):
+            seen.append(scheduler.clients._entries[id(self)][2])
+            return prompt
+
+    scheduler.clients.factory = LeaseChecking
+    llm = scheduler.clients.get("m", "key")
+    assert scheduler.invoke_many(llm, "m", ["a", "b"], [1, 1]) == ["a", "b"]
+    assert max(seen) >= 1
+    assert scheduler.clients._entries[id(llm)][2] == 0
@@ -0,0 +1,76 @@
+import random
+
+from summarizer import dedup
+from summarizer.cache import DiskCache, SummaryCache
+from summarizer.dedup import DuplicateIndex, minhash_signature
+
+
+def signature(seed):
+    rng = random.Random(seed)
+    return minhash_signature([" ".join(f"w{rng.randrange(5000)}" for _ in range(2000))])
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dedup.time, "time", lambda: now[0])
+    path = str(tmp_path / "duplicates.sqlite3")
+    index = DuplicateIndex(path, ttl=60)
+    sig = signature(1)
+    index.add("a", sig)
+    assert index.find(sig) == [("a", 1.0)]
+
+    now[0] += 30
+    index.add("a", sig)  # stored or served again: stays alive
+    now[0] += 45
+    assert index.find(sig) == [("a", 1.0)]
+
+    now[0] += 61
+    assert index.find(sig) == []
+    assert len(index) == 0
+    assert len(DuplicateIndex(path, ttl=60)) == 0
+
+
+def test_least_recently_added_go_past_the_cap(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dedup.time, "time", lambda: now[0])
+    index = DuplicateIndex(str(tmp_path / "duplicates.sqlite3"), max_entries=2)
+    for i, digest in enumerate("abc"):
+        now[0] += 1
+        index.add(digest, signature(i))
+    assert len(index) == 2
+    assert index.find(signature(0)) == []
+    assert index.find(signature(2)) == [("c", 1.0)]
+
+
+def test_remove_drops_dead_candidates(tmp_path):
+    path = str(tmp_path / "duplicates.sqlite3")
+    index = DuplicateIndex(path)
+    sig = signature(3)
+    index.add("a", sig)
+    index.remove(["a"])
+    assert index.find(sig) == []
+    assert len(DuplicateIndex(path)) == 0
+
+
+def test_stored_digests_reflects_the_disk_cache(tmp_path):
+    cache = SummaryCache(disk=DiskCache(str(tmp_path / "summaries.sqlite3")))
+    cache.set("key-a", "summary", digest="a")
+    cache.set("key-b", "summary", digest="b")
+    cache.disk.delete("key-b")
+    assert cache.stored_digests(["a", "b", "c"]) == {"a"}
+    assert SummaryCache().stored_digests(["a"]) == {"a"}
+
+
+def test_signatures_are_kept_packed_and_near_duplicates_found_after_reopen(tmp_path):
+    path = str(tmp_path / "duplicates.sqlite3")
+    index = DuplicateIndex(path)
+    sig = signature(4)
+    index.add("a", sig)
+    assert index._signatures["a"] == dedup._pack(sig)
+    assert all(isinstance(key, int) for key in index._buckets)
+
+    # Change every tenth bin: most bands still match and the similarity stays above the threshold
+    near = tuple(value ^ 1 if i % 10 == 0 else value for i, value in enumerate(sig))
+    [(digest, score)] = DuplicateIndex(path).find(near)
+    assert digest == "a"
+    assert score == dedup.similarity(sig, near) < 1.0
@@ -0,0 +1,77 @@
+import io
+import os
+
+import pytest
+
+from summarizer.exceptions import SourceLoadError
+from summarizer.files import iter_file_pages, iter_text_pages, remove_upload, save_upload, sweep_uploads
+
+
+def test_upload_is_copied_and_removed(tmp_path):
+    directory = str(tmp_path / "uploads")
+    path = save_upload(io.BytesIO(b"hello world"), "notes.txt", directory)
+    assert os.path.basename(path) == "notes.txt"
+    assert open(path, "rb").read() == b"hello world"
+    assert save_upload(io.BytesIO(b"hello world"), "notes.txt", directory) != path
+
+    remove_upload(path, directory)
+    assert not os.path.exists(os.path.dirname(path))
+
+
+def test_failed_copy_leaves_nothing_behind(tmp_path):
+    class Broken(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError("disk gone")
+
+    directory = str(tmp_path / "uploads")
+    with pytest.raises(OSError):
+        save_upload(Broken(), "notes.txt", directory)
+    assert os.listdir(directory) == []
+
+
+def test_remove_upload_ignores_paths_it_did_not_create(tmp_path):
+    own = tmp_path / "mine" / "notes.txt"
+    own.parent.mkdir()
+    own.write_text("keep")
+    remove_upload(str(own), str(tmp_path / "uploads"))
+    assert own.exists()
+
+
+def test_stale_uploads_are_swept(tmp_path):
+    directory = str(tmp_path / "uploads")
+    old = save_upload(io.BytesIO(b"old"), "old.txt", directory)
+    os.utime(os.path.dirname(old), (0, 0))
+    new = save_upload(io.BytesIO(b"new"), "new.txt", directory)
+    assert not os.path.exists(old) and os.path.exists(new)
+    sweep_uploads(directory, max_age=-1)
+    assert os.listdir(directory) == []
+
+
+def test_text_pages_do_not_split_words(tmp_path):
+    pytest.importorskip("langchain")
+    path = tmp_path / "notes.md"
+    path.write_text("alpha beta gamma\n" * 100)
+    pages = list(iter_text_pages(str(path), page_chars=100))
+    assert len(pages) > 1
+    words = [word for page in pages for word in page.page_content.split()]
+    assert words == ["alpha", "beta", "gamma"] * 100
+
+
+def test_empty_text_file_has_no_ocr_hint(tmp_path):
+    pytest.importorskip("langchain")
+    path = tmp_path / "notes.txt"
+    path.write_text("  \n\n")
+    with pytest.raises(SourceLoadError) as e:
+        list(iter_file_pages(str(path)))
+    assert str(e.value) == "No text found in notes.txt"
+
+
+def test_textless_pdf_suggests_ocr(tmp_path):
+    pymupdf = pytest.importorskip("pymupdf")
+    pytest.importorskip("langchain")
+    path = str(tmp_path / "scan.pdf")
+    with pymupdf.open() as pdf:
+        pdf.new_page()
+        pdf.save(path)
+    with pytest.raises(SourceLoadError, match="scanned PDFs need OCR first"):
+        list(iter_file_pages(path))
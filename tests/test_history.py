@@ -0,0 +1,64 @@
+import sqlite3
+
+from summarizer.history import HistoryStore, history_owner
+
+
+def entry(day, model="llama3-8b-8192", processing_time=2.0):
+    return {
+        'timestamp': f"{day}T12:00:00",
+        'model': model,
+        'content_info': {'type': "Direct Text"},
+        'processing_time': processing_time,
+        'word_count': 100,
+        'compression_ratio': 0.5,
+        'summary': f"summary of {day}"
+    }
+
+
+def test_owners_only_see_their_own_history(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    alice, bob = history_owner("key-a"), history_owner(session_id="browser-b")
+    store.add(alice, entry("2026-01-01"))
+    store.add(alice, entry("2026-01-02", model="gemma2-9b-it", processing_time=4.0))
+    store.add(bob, entry("2026-01-02"))
+
+    assert store.stats(alice)['total_summaries'] == 2
+    assert store.stats(alice)['average_processing_time'] == 3.0
+    assert [e['summary'] for e in store.page(alice)] == ["summary of 2026-01-02", "summary of 2026-01-01"]
+    assert [e['summary'] for e in store.iter_entries(bob)] == ["summary of 2026-01-02"]
+    assert store.usage_by_day(bob) == [("2026-01-02", 1)]
+    assert dict(store.model_counts(alice)) == {"llama3-8b-8192": 1, "gemma2-9b-it": 1}
+    assert len(store.processing_times(bob)) == 1
+
+    version = store.stats(alice)['version']
+    store.clear(alice)
+    assert store.stats(alice)['total_summaries'] == 0
+    assert store.stats(alice)['version'] > version
+    assert store.page(alice) == [] and store.usage_by_day(alice) == []
+    assert store.stats(bob)['total_summaries'] == 1
+
+
+def test_owner_id_does_not_contain_the_key():
+    assert "secret" not in history_owner("secret")
+    assert history_owner("secret") == history_owner("secret") != history_owner("other")
+
+
+def test_rows_from_before_owners_are_hidden(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, model TEXT,"
+        " source_type TEXT, processing_time REAL, word_count INTEGER, compression_ratio REAL, cache_hit INTEGER,"
+        " entry TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO history (timestamp, model, entry) VALUES ('2026-01-01T00:00:00', 'm', '{}')")
+    conn.execute("CREATE TABLE history_totals (id INTEGER PRIMARY KEY, version INTEGER)")
+    conn.commit()
+    conn.close()
+
+    store = HistoryStore(path)
+    owner = history_owner("key")
+    assert store.stats(owner)['total_summaries'] == 0
+    store.add(owner, entry("2026-01-03"))
+    assert store.count(owner) == 1
+    assert store.page(owner)[0]['summary'] == "summary of 2026-01-03"
@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip("langchain")
+
+from benchmarks.memory_check import CASES, check_case
+
+# Ten times the words; small enough to keep the suite quick
+SIZES = [20_000, 200_000]
+TOLERANCE = 1.5
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_memory_does_not_grow_with_document_size(name):
+    ok, rows = check_case(name, SIZES, TOLERANCE)
+    assert ok, f"{name}: (words, working bytes, retained bytes) = {rows}"
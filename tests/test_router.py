@@ -0,0 +1,48 @@
+import pytest
+
+from summarizer.chains import input_token_budget
+from summarizer.prompts import build_prompt_template
+from summarizer.router import route_model, single_call_budget
+
+WORDS = 200
+TEMPLATE = build_prompt_template("🎯 Executive Summary", WORDS, "English")
+# mixtral's free-tier 5000 tokens/min caps it far below its 32K window; these limits lift that
+HIGH_TPM = {"mixtral-8x7b-32768": (30, 100_000)}
+
+
+@pytest.mark.parametrize("candidates, limits, boundary_model, offset, expected, fits", [
+    # Context window of the fastest model
+    (None, None, "llama3-8b-8192", 0, "llama3-8b-8192", True),
+    (None, None, "llama3-8b-8192", 1, "llama3-8b-8192", False),
+    # Past 8K, the 32K window helps only when its tokens-per-minute limit allows the call
+    (None, HIGH_TPM, "llama3-8b-8192", 1, "mixtral-8x7b-32768", True),
+    (None, HIGH_TPM, "mixtral-8x7b-32768", 0, "mixtral-8x7b-32768", True),
+    (None, HIGH_TPM, "mixtral-8x7b-32768", 1, "llama3-8b-8192", False),
+    # Tokens-per-minute limits below the context window
+    (["mixtral-8x7b-32768"], None, "mixtral-8x7b-32768", 0, "mixtral-8x7b-32768", True),
+    (["mixtral-8x7b-32768"], None, "mixtral-8x7b-32768", 1, "mixtral-8x7b-32768", False),
+    (["llama3-70b-8192", "mixtral-8x7b-32768"], None, "mixtral-8x7b-32768", 1, "llama3-70b-8192", True),
+    (["llama3-70b-8192", "mixtral-8x7b-32768"], None, "llama3-70b-8192", 1, "mixtral-8x7b-32768", False),
+    # Equal speed: the larger window is tried first, then the other model
+    (["gemma2-9b-it", "mixtral-8x7b-32768"], None, "mixtral-8x7b-32768", 1, "gemma2-9b-it", True),
+    (["gemma2-9b-it", "mixtral-8x7b-32768"], HIGH_TPM, "gemma2-9b-it", 0, "mixtral-8x7b-32768", True),
+])
+def test_route_model_boundaries(candidates, limits, boundary_model, offset, expected, fits):
+    token_count = single_call_budget(boundary_model, WORDS, TEMPLATE, limits) + offset
+    decision = route_model(token_count, WORDS, TEMPLATE, candidates, limits)
+    assert (decision.model, decision.fits) == (expected, fits)
+    assert decision.token_count == token_count
+
+
+def test_single_call_budget_takes_the_tighter_limit():
+    # llama3-8b is bounded by its window, mixtral by its tokens per minute unless those are raised
+    assert single_call_budget("llama3-8b-8192", WORDS, TEMPLATE) == input_token_budget("llama3-8b-8192", WORDS, TEMPLATE)
+    assert single_call_budget("mixtral-8x7b-32768", WORDS, TEMPLATE) < 5000
+    assert (single_call_budget("mixtral-8x7b-32768", WORDS, TEMPLATE, HIGH_TPM)
+            == input_token_budget("mixtral-8x7b-32768", WORDS, TEMPLATE))
+
+
+def test_unknown_candidates_fall_back_to_every_model():
+    decision = route_model(100, WORDS, TEMPLATE, ["not-a-model"])
+    assert decision.model == "llama3-8b-8192"
+    assert len(decision.candidates) == 4
@@ -0,0 +1,100 @@
+import asyncio
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from summarizer import scheduler as scheduler_module
+from summarizer.scheduler import LLMScheduler, TokenBucket, retry_after_seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("429")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+
+def test_bucket_charges_and_refills(clock):
+    bucket = TokenBucket(600)  # 10 per second
+    assert bucket.wait_time(600) == 0
+    bucket.take(600)
+    assert bucket.wait_time(100) == pytest.approx(10)
+    clock[0] = 5
+    assert bucket.wait_time(100) == pytest.approx(5)
+    clock[0] = 1000
+    assert bucket.wait_time(600) == 0 and bucket.level == 600
+
+
+def test_oversized_request_does_not_wait_for_a_full_bucket(clock):
+    bucket = TokenBucket(6000)
+    bucket.take(3000)
+    # Larger than the whole bucket: goes now instead of stalling 30 s for a refill
+    assert bucket.wait_time(7000) == 0
+    bucket.take(7000)
+    # Charged one bucket at most, and the debt holds back whoever comes next
+    assert bucket.level == -3000
+    assert bucket.wait_time(7000) == pytest.approx(30)
+    assert bucket.wait_time(100) == pytest.approx(31)
+
+
+def test_retry_after_header_formats():
+    assert retry_after_seconds(RateLimited("7")) == 7.0
+    assert retry_after_seconds(RateLimited(formatdate(0, usegmt=True))) == 0.0
+    assert retry_after_seconds(RateLimited("soon")) is None
+    assert retry_after_seconds(RateLimited()) is None
+
+
+def test_backoff_prefers_retry_after_and_caps_it():
+    scheduler = LLMScheduler(base_delay=1.0, max_delay=60.0)
+    assert scheduler.backoff_delay(0, RateLimited("3")) == 3.0
+    assert scheduler.backoff_delay(0, RateLimited("600")) == 60.0
+    assert 4.0 <= scheduler.backoff_delay(3, RateLimited()) <= 8.0
+    assert scheduler.backoff_delay(10, RateLimited()) <= 60.0
+
+
+def test_rate_limited_calls_are_retried(monkeypatch):
+    scheduler = LLMScheduler(limits={"m": (1000, 1_000_000)}, max_retries=2, base_delay=0.001)
+    slept = []
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", lambda delay: (slept.append(delay), real_sleep(0))[1])
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited("0.5")
+        return "done"
+
+    assert scheduler.run(scheduler.call("m", 10, flaky)) == "done"
+    assert len(attempts) == 3 and slept == [0.5, 0.5]
+
+    attempts.clear()
+
+    async def always_limited():
+        attempts.append(1)
+        raise RateLimited("0")
+
+    with pytest.raises(RateLimited):
+        scheduler.run(scheduler.call("m", 10, always_limited))
+    assert len(attempts) == 3
+
+
+def test_other_errors_are_not_retried():
+    scheduler = LLMScheduler(limits={"m": (1000, 1_000_000)})
+    attempts = []
+
+    async def broken():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.run(scheduler.call("m", 10, broken))
+    assert attempts == [1]
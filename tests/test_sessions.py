@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from summarizer.groq_api import http_session
+from summarizer.sessions import shared_session
+from summarizer.web import web_session
+
+
+def test_sessions_are_shared_per_name():
+    assert shared_session("test", headers={"X-Test": "1"}) is shared_session("test")
+    assert shared_session("test").headers["X-Test"] == "1"
+    assert web_session() is web_session()
+    assert web_session() is not http_session()
+
+
+def test_pool_size_is_applied():
+    session = shared_session("test-pool", pool_connections=2, pool_maxsize=8)
+    adapter = session.get_adapter("https://example.com")
+    assert adapter._pool_connections == 2 and adapter._pool_maxsize == 8
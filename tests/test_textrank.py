@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+from summarizer.compress import WINDOW_WORDS, split_sentences
+
+
+def doc(text):
+    return SimpleNamespace(page_content=text)
+
+
+def test_unpunctuated_text_is_cut_into_windows():
+    words = [f"w{i}" for i in range(WINDOW_WORDS * 3)]
+    sentences = list(split_sentences([doc("First one. Second one! " + " ".join(words))]))
+    assert sentences[:2] == ["First one.", "Second one!"]
+    assert [len(s.split()) for s in sentences[2:]] == [WINDOW_WORDS] * 3
+
+
+def test_custom_tokenizer_is_used():
+    assert list(split_sentences([doc("a|b")], tokenize=lambda text: text.split("|"))) == ["a", "b"]
+
+
+def test_textrank_summary_stays_within_budget():
+    pytest.importorskip("numpy")
+    from summarizer.textrank import textrank_summary
+
+    text = " ".join(f"Topic {i % 7} matters for reason {i}. The market grew in year {i}." for i in range(50))
+    summary, info = textrank_summary([doc(text)], word_count=40)
+    assert 0 < len(summary.split()) <= 40
+    assert info['selected_sentences'] >= 1 and info['sentences'] == 100